@@ -1,59 +1,44 @@
-import numpy as np
+import atexit
 import random
 import pygame
 import sys
 import math
 import cv2
-import csv
 import os
+import queue
+import threading
+import time
+from collections import OrderedDict
 from datetime import datetime
 
+from engine import SearchLimits
+from engine import TranspositionTable
+from engine.ai import DIFFICULTY_LEVELS, search_ai_move
+from engine.board import (create_board, drop_piece, get_next_open_row, get_valid_locations,
+                          is_valid_location, winning_move_at)
+from engine.dataset import CONTINUOUS_CSV_FILE, CSVSink, build_row
+from engine.explain import explain_move
+
 move_counter = 1
 
 session_timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
 
 # -------------------------------------------------------------------
 # CONTINUOUS CSV INTEGRATION
-# Appends to a single CSV file across all sessions.
+# Appends to a single CSV file across all sessions (engine/dataset.py).
 # Header row is written automatically if the file does not exist.
 # -------------------------------------------------------------------
 
-#continuous data pipeline for ML training 
-CSV_DIR = "datasets"
-CONTINUOUS_CSV_FILE = os.path.join(CSV_DIR, "continuous_gameplay_log.csv")
-
-# CSV column headers — structured for machine learning training
-CSV_HEADERS = [
-    "session_id",        # Session identifier (timestamp-based)
-    "game_number",       # Game index within the session
-    "move_number",       # Move number within the game
-    "player",            # Player who made the move (PLAYER / AI_Warrior)
-    "match_type",        # Match type (PVE / PVP)
-    "game_mode",         # Game mode (CLASSIC / CONQUER)
-    "difficulty",        # AI difficulty level
-    "chosen_column",     # Column selected for the move
-    "minimax_score",     # Minimax calculated score
-    "ai_explanation",    # AI decision explanation
-    "p1_towers",         # Remaining towers for Player 1 (CONQUER mode)
-    "p2_towers",         # Remaining towers for Player 2 / AI (CONQUER mode)
-    "board_flat",        # Board state flattened to 42 comma-separated cells
-    "timestamp"          # Timestamp of the move
-]
-
 # Session identifier — created once when the program starts
 SESSION_ID = session_timestamp
 
 # Game counter within the current session
 game_number_counter = 1
 
-# Create the datasets directory if it does not exist
-os.makedirs(CSV_DIR, exist_ok=True)
-
-# Write header row only if the CSV file does not yet exist
-if not os.path.exists(CONTINUOUS_CSV_FILE):
-    with open(CONTINUOUS_CSV_FILE, "w", newline="", encoding="utf-8") as csv_init:
-        writer = csv.DictWriter(csv_init, fieldnames=CSV_HEADERS)
-        writer.writeheader()
+# Long-lived buffered writer: creates the datasets directory and the header row if needed,
+# recovers rows a crashed session left in its journal, and is flushed at every game end
+csv_sink = CSVSink(CONTINUOUS_CSV_FILE)
+atexit.register(csv_sink.close)
 
 # -------------------------------------------------------------------
 # STATISTICAL RECORDS (metrics to be included in the group report)
@@ -95,14 +80,13 @@ current_match_type = "PVE"
 p1_towers = 3
 p2_towers = 3
 
-# AI DIFFICULTY LEVELS
-DIFFICULTY_LEVELS = {
-    "EASY": {"depth": 1, "label": "EASY"},
-    "NORMAL": {"depth": 3, "label": "MEDIUM"},
-    "HARD": {"depth": 5, "label": "HARD"}
-}
+# AI DIFFICULTY LEVELS are defined in engine/ai.py
 current_difficulty = "HARD"
 
+# Transposition table shared by every AI search within a game (cleared on reset)
+TRANSPOSITION_TABLE_SIZE = 1 << 18
+transposition_table = TranspositionTable(TRANSPOSITION_TABLE_SIZE)
+
 BLUE = (0,0,255)
 BLACK = (0,0,0)
 RED = (255,0,0)
@@ -130,53 +114,6 @@ height = (ROW_COUNT+1) * SQUARESIZE
 size = (width, height)
 RADIUS = int(SQUARESIZE/2 - 5)
 
-def create_board():
-    board = np.zeros((ROW_COUNT,COLUMN_COUNT))
-    return board
-
-def drop_piece(board, row, col, piece):
-    board[row][col] = piece
-
-def is_valid_location(board, col):
-    return board[ROW_COUNT-1][col] == 0
-
-#gravity & matrix mapping
-#drop piece synchronization
-def get_next_open_row(board, col):
-    for r in range(ROW_COUNT):
-        if board[r][col] == 0:
-            return r
-#flipping for synchronization the game board
-def print_board(board):
-    print(np.flip(board, 0))
-
-def winning_move(board, piece):
-    # Check horizontal locations for win
-    for c in range(COLUMN_COUNT-3):
-        for r in range(ROW_COUNT):
-            if board[r][c] == piece and board[r][c+1] == piece and board[r][c+2] == piece and board[r][c+3] == piece:
-                return True
-
-    # Check vertical locations for win
-    for c in range(COLUMN_COUNT):
-        for r in range(ROW_COUNT-3):
-            if board[r][c] == piece and board[r+1][c] == piece and board[r+2][c] == piece and board[r+3][c] == piece:
-                return True
-
-    # Check positively sloped diaganols
-    for c in range(COLUMN_COUNT-3):
-        for r in range(ROW_COUNT-3):
-            if board[r][c] == piece and board[r+1][c+1] == piece and board[r+2][c+2] == piece and board[r+3][c+3] == piece:
-                return True
-
-    # Check negatively sloped diaganols
-    for c in range(COLUMN_COUNT-3):
-        for r in range(3, ROW_COUNT):
-            if board[r][c] == piece and board[r-1][c+1] == piece and board[r-2][c+2] == piece and board[r-3][c+3] == piece:
-                return True
-    
-    return False
-
 def reset_game(full_reset=True):
     global move_counter, p1_towers, p2_towers, game_number_counter
     
@@ -190,154 +127,58 @@ def reset_game(full_reset=True):
         game_number_counter += 1
     
     new_board = create_board()
+
+    # The worker must be stopped before the shared table is cleared
+    cancel_ai_search()
+
+    # Positions of the previous board can never occur again
+    transposition_table.clear()
     
     # Clear the winning message for new game
     screen.blit(game_bg_image , (0,0))
     draw_board(new_board)
-    pygame.display.update()
     new_turn = random.randint(PLAYER,AI)
     return new_board , False , new_turn
 
-def evaluate_window(window, piece):
-    score = 0
-    opp_piece = PLAYER_PIECE
-    if piece == PLAYER_PIECE:
-        opp_piece = AI_PIECE
-
-    #heuristic evaluation table - strategic weight point mechanism
-    #winning situation
-    if window.count(piece) == 4:
-        score += 100
-    #offensive threat
-    elif window.count(piece) == 3 and window.count(EMPTY) == 1:
-        score += 5
-    #strategic development process
-    elif window.count(piece) == 2 and window.count(EMPTY) == 2:
-        score += 2
-    #defensive block
-    if window.count(opp_piece) == 3 and window.count(EMPTY) == 1:
-        score -= 4
-
-    return score
-
-def score_position(board, piece):
-    score = 0
-
-    # Score center column
-    #center column is critical area for winning the game
-    center_array = [int(i) for i in list(board[:, COLUMN_COUNT//2])]
-    center_count = center_array.count(piece)
-    #assign *3 point for pieces of the center columns
-    score += center_count * 3
-
-    # Score Horizontal
-    for r in range(ROW_COUNT):
-        row_array = [int(i) for i in list(board[r,:])]
-        for c in range(COLUMN_COUNT-3):
-            window = row_array[c:c+WINDOW_LENGTH]
-            score += evaluate_window(window, piece)
-
-    # Score Vertical
-    for c in range(COLUMN_COUNT):
-        col_array = [int(i) for i in list(board[:,c])]
-        #obstruct the memory overflow - boundary & index management
-        for r in range(ROW_COUNT-3):
-            window = col_array[r:r+WINDOW_LENGTH]
-            score += evaluate_window(window, piece)
-
-    # Score positive sloped diagonal
-    for r in range(ROW_COUNT-3):
-        for c in range(COLUMN_COUNT-3):
-            window = [board[r+i][c+i] for i in range(WINDOW_LENGTH)]
-            score += evaluate_window(window, piece)
-
-    for r in range(ROW_COUNT-3):
-        for c in range(COLUMN_COUNT-3):
-            window = [board[r+3-i][c+i] for i in range(WINDOW_LENGTH)]
-            score += evaluate_window(window, piece)
-
-    return score
-#game is over - depends to 3 option:
-def is_terminal_node(board):
-    return winning_move(board, PLAYER_PIECE) or winning_move(board, AI_PIECE) or len(get_valid_locations(board)) == 0
-
-#Minimax Algorithm Implementations (w/alpha-beta pruning)
-#main decision mechanism
-def minimax(board, depth, alpha, beta, maximizingPlayer):
-    valid_locations = get_valid_locations(board)
-    is_terminal = is_terminal_node(board)
-    if depth == 0 or is_terminal:
-        if is_terminal:
-            if winning_move(board, AI_PIECE):
-                #definite victory for ai -> positive infinite value
-                return (None, 100000000000000)
-            elif winning_move(board, PLAYER_PIECE):
-                #definite victory for client -> negative infinite value
-                return (None, -10000000000000)
-            else: # Game is over, no more valid moves
-                return (None, 0)
-        else: # Depth is zero
-            return (None, score_position(board, AI_PIECE))
-    if maximizingPlayer:
-        value = -math.inf
-        column = random.choice(valid_locations)
-        for col in valid_locations:
-            row = get_next_open_row(board, col)
-            b_copy = board.copy()  #state immutability
-            drop_piece(b_copy, row, col, AI_PIECE)
-            new_score = minimax(b_copy, depth-1, alpha, beta, False)[1] #recursive algorithm
-            if new_score > value: #choose the best one
-                value = new_score
-                column = col
-            #CPU optimization , alpha = best option , beta = worst option
-            #stop scanning
-            alpha = max(alpha, value)
-            if alpha >= beta:
-                break
-        return column, value
-
-    #the human perspective - through the eyes of ai
-    else: # Minimizing player
-        value = math.inf
-        column = random.choice(valid_locations)
-        for col in valid_locations:
-            row = get_next_open_row(board, col)
-            b_copy = board.copy()
-            drop_piece(b_copy, row, col, PLAYER_PIECE)
-            new_score = minimax(b_copy, depth-1, alpha, beta, True)[1]
-            if new_score < value:
-                value = new_score
-                column = col
-            beta = min(beta, value)
-            if alpha >= beta:
-                break
-        return column, value
-
-#action space
-def get_valid_locations(board):
-    valid_locations = []
-    for col in range(COLUMN_COUNT):
-        if is_valid_location(board, col):
-            valid_locations.append(col)
-    return valid_locations
-
-#fallback modular structure for basic structure of the game - depth1
-def pick_best_move(board, piece):
-    valid_locations = get_valid_locations(board)
-    best_score = -10000
-    best_col = random.choice(valid_locations)
-    for col in valid_locations:
-        row = get_next_open_row(board, col)
-        temp_board = board.copy()
-        drop_piece(temp_board, row, col, piece)
-        score = score_position(temp_board, piece)
-        if score > best_score:
-            best_score = score
-            best_col = col
-
-    return best_col
-
-def write_move_to_csv(player_label, chosen_col, minimax_score_val, ai_exp, board_state):
+# -------------------------------------------------------------------
+# BACKGROUND AI SEARCH
+# The search runs on a worker thread so the event loop keeps running
+# (QUIT, F11, ESC) while the AI thinks. The chosen move is applied on
+# the main thread once the job is done.
+# -------------------------------------------------------------------
+THINKING_FPS = 60
+
+ai_job = None
+
+class AISearchJob:
+    def __init__(self, board, level):
+        self.level = level
+        self.result = None
+        self.cancel_event = threading.Event()
+        self.limits = SearchLimits(level.get("time_ms"), level.get("nodes"), cancel=self.cancel_event)
+        self.board = board.copy()  # the worker never touches the live board
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+
+    def _run(self):
+        self.result = search_ai_move(self.board, self.level, self.limits, transposition_table)
+
+    def done(self):
+        return not self.thread.is_alive()
+
+    def cancel(self):
+        self.cancel_event.set()
+        self.thread.join()
+
+#stop a running search (pause, menu, rematch) - its result is thrown away
+def cancel_ai_search():
+    global ai_job
+    if ai_job is not None:
+        ai_job.cancel()
+        ai_job = None
+
+def write_move_to_csv(player_label, chosen_col, minimax_score_val, ai_exp, board_state, search_depth=None, search_stats=None,
+                      pv=None, root_scores=None):
     """
     Appends each move to the continuous CSV file (append mode).
     Called for both player and AI moves.
@@ -345,31 +186,12 @@ def write_move_to_csv(player_label, chosen_col, minimax_score_val, ai_exp, board
     """
     global p1_towers, p2_towers, game_number_counter, session_stats
 
-    # Flatten the board to a 1D string (42 cells, comma-separated)
-    #feature vector format transformation for ml training
-    board_flat_str = ",".join(str(int(cell)) for row in board_state for cell in row)
-
-    row_data = {
-        "session_id":      SESSION_ID,
-        "game_number":     game_number_counter,
-        "move_number":     move_counter,
-        "player":          player_label,
-        "match_type":      current_match_type,
-        "game_mode":       current_game_mode,
-        "difficulty":      current_difficulty if current_match_type == "PVE" else "N/A",
-        "chosen_column":   int(chosen_col),
-        "minimax_score":   float(minimax_score_val) if minimax_score_val is not None else "N/A",
-        "ai_explanation":  ai_exp if ai_exp else "N/A",
-        "p1_towers":       p1_towers,
-        "p2_towers":       p2_towers,
-        "board_flat":      board_flat_str,
-        "timestamp":       str(datetime.now())
-    }
-
-    # Append row to the continuous CSV file (append mode — file is never deleted)
-    with open(CONTINUOUS_CSV_FILE, "a", newline="", encoding="utf-8") as csv_file:
-        writer = csv.DictWriter(csv_file, fieldnames=CSV_HEADERS)
-        writer.writerow(row_data)
+    row_data = build_row(SESSION_ID, game_number_counter, move_counter, player_label,
+                         current_match_type, current_game_mode,
+                         current_difficulty if current_match_type == "PVE" else "N/A",
+                         chosen_col, minimax_score_val, ai_exp, p1_towers, p2_towers,
+                         board_state, search_depth, search_stats, pv, root_scores)
+    csv_sink.write(row_data)
 
     # Update session statistics
     session_stats["total_moves"] += 1
@@ -425,6 +247,9 @@ def log_final_result(winner_piece):
 def process_win(piece):
     global game_over, p1_towers, p2_towers, board, turn
     
+    # The round is over - write out the buffered moves
+    csv_sink.flush()
+
     draw_board(board)
     screen.blit(game_bg_image, (0,0), (0, 0, width, SQUARESIZE))
     
@@ -441,10 +266,11 @@ def process_win(piece):
         else:
             p1_towers = max(0, p1_towers - 1)
             msg = f"{opponent_name} DESTROYS A TOWER!"
+        render_castles(clear=True)
             
         label = win_font.render(msg, 1, RED if piece == PLAYER_PIECE else YELLOW)
         screen.blit(label, (width/2 - label.get_width()/2, 30))
-        pygame.display.update()
+        present()
         
         if p1_towers == 0 or p2_towers == 0:
             game_over = True
@@ -476,6 +302,8 @@ def process_win(piece):
 def process_draw():
     global game_over, board, turn
     
+    csv_sink.flush()
+
     draw_board(board)
     screen.blit(game_bg_image, (0,0), (0, 0, width, SQUARESIZE))
     
@@ -483,7 +311,7 @@ def process_draw():
         msg = "BATTLE DRAW! NO TOWERS LOST!"
         label = win_font.render(msg, 1, WHITE)
         screen.blit(label, (width/2 - label.get_width()/2, 30))
-        pygame.display.update()
+        present()
         
         pygame.time.wait(2500)
         board, _, turn = reset_game(full_reset=False)
@@ -492,44 +320,456 @@ def process_draw():
         msg = "IT'S A DRAW!!"
         label = win_font.render(msg, 1, WHITE)
         screen.blit(label, (width/2 - label.get_width()/2, 30))
+        present()
+
+# -------------------------------------------------------------------
+# FRAME TIMING
+# CONNECT4_FRAME_STATS=1 python connect_4.py prints, every few seconds,
+# how long the presented frames took (from the event or loop pass that
+# started the frame to its display update) and how much of the screen
+# they pushed to the display.
+# -------------------------------------------------------------------
+FRAME_REPORT_SECONDS = 5.0
+
+class FrameTimer:
+    def __init__(self, enabled, report_seconds=FRAME_REPORT_SECONDS):
+        self.enabled = enabled
+        self.report_seconds = report_seconds
+        self.started = None
+        self.samples = []
+        self.pixels = 0
+        self.last_report = time.perf_counter()
+        self.last_cpu = time.process_time()
+
+    def start(self):
+        if self.enabled:
+            self.started = time.perf_counter()
+
+    def stop(self, rects=None):
+        # only the first update of a frame counts - later ones follow waits (win banners ...)
+        if self.started is None:
+            return
+        now = time.perf_counter()
+        self.samples.append(now - self.started)
+        self.pixels += width * height if rects is None else sum(pygame.Rect(r).width * pygame.Rect(r).height for r in rects)
+        self.started = None
+        if now - self.last_report >= self.report_seconds:
+            self.report(now)
+
+    def report(self, now):
+        samples = sorted(self.samples)
+        avg = sum(samples) / len(samples)
+        p95 = samples[int(0.95 * (len(samples) - 1))]
+        area = self.pixels / len(samples) / (width * height)
+        # process CPU time over wall time (includes the AI search thread)
+        cpu_now = time.process_time()
+        cpu = (cpu_now - self.last_cpu) / (now - self.last_report)
+        print(f"[FRAME] {len(samples)} frames in {now - self.last_report:.1f} s: avg {1000*avg:.2f} ms, "
+              f"p95 {1000*p95:.2f} ms, max {1000*samples[-1]:.2f} ms, {area:.0%} of the screen updated per frame, "
+              f"CPU {cpu:.0%}")
+        self.samples = []
+        self.pixels = 0
+        self.last_report = now
+        self.last_cpu = cpu_now
+
+frame_timer = FrameTimer(os.environ.get("CONNECT4_FRAME_STATS") == "1")
+
+def present(rects=None):
+    """pygame.display.update for the whole screen, or only for rects."""
+    if rects is None:
         pygame.display.update()
+    else:
+        pygame.display.update(rects)
+    frame_timer.stop(rects)
 
-def draw_board(board):
+# -------------------------------------------------------------------
+# BOARD RENDERING
+# The empty grid is rendered once into board_surface (build_board_surfaces
+# runs after the display is created) and every cell state has a prebuilt
+# opaque tile, so a piece is one blit. During play only the changed
+# rectangles are pushed to the display: the hover strip, the dropped
+# cell and the castle panels. draw_board() is the full redraw used after
+# a screen change (new round, resume, F11).
+# -------------------------------------------------------------------
+BOARD_RECT = pygame.Rect(X_OFFSET, SQUARESIZE, COLUMN_COUNT * SQUARESIZE, ROW_COUNT * SQUARESIZE)
+HOVER_RECT = pygame.Rect(0, 0, width, SQUARESIZE)
+CASTLE_PANELS = [pygame.Rect(0, SQUARESIZE, X_OFFSET, height - SQUARESIZE),
+                 pygame.Rect(width - X_OFFSET, SQUARESIZE, X_OFFSET, height - SQUARESIZE)]
+
+def build_board_surfaces():
+    tiles = {}
+    for piece, color in ((EMPTY, BLACK), (PLAYER_PIECE, RED), (AI_PIECE, YELLOW)):
+        tile = pygame.Surface((SQUARESIZE, SQUARESIZE)).convert()
+        tile.fill(BLUE)
+        pygame.draw.circle(tile, color, (int(SQUARESIZE/2), int(SQUARESIZE/2)), RADIUS)
+        tiles[piece] = tile
+    grid = pygame.Surface(BOARD_RECT.size).convert()
     for c in range(COLUMN_COUNT):
         for r in range(ROW_COUNT):
-            pygame.draw.rect(screen, BLUE, (c*SQUARESIZE + X_OFFSET, r*SQUARESIZE+SQUARESIZE, SQUARESIZE, SQUARESIZE))
-            pygame.draw.circle(screen, BLACK, (int(c*SQUARESIZE + X_OFFSET + SQUARESIZE/2), int(r*SQUARESIZE+SQUARESIZE+SQUARESIZE/2)), RADIUS)
-    
-    for c in range(COLUMN_COUNT):
-        for r in range(ROW_COUNT):      
-            if board[r][c] == PLAYER_PIECE:
-                pygame.draw.circle(screen, RED, (int(c*SQUARESIZE + X_OFFSET + SQUARESIZE/2), height-int(r*SQUARESIZE+SQUARESIZE/2)), RADIUS)
-            elif board[r][c] == AI_PIECE: 
-                pygame.draw.circle(screen, YELLOW, (int(c*SQUARESIZE + X_OFFSET + SQUARESIZE/2), height-int(r*SQUARESIZE+SQUARESIZE/2)), RADIUS)
-                
-    if current_game_mode == "CONQUER":
-        if castles_loaded:
-            screen.blit(red_castles[p1_towers], (5, height - CASTLE_HEIGHT - 10))
-            screen.blit(yellow_castles[p2_towers], (width - CASTLE_WIDTH - 5, height - CASTLE_HEIGHT - 10))
-        else:
-            # Fallback if images fail to load
-            opponent_short = "AI" if current_match_type == "PVE" else "P2"
-            p1_txt = top_button_font.render(f"P1: {p1_towers}", 1, RED)
-            p2_txt = top_button_font.render(f"{opponent_short}: {p2_towers}", 1, YELLOW)
-            screen.blit(p1_txt, (20, height/2))
-            screen.blit(p2_txt, (width - X_OFFSET + 20, height/2))
+            grid.blit(tiles[EMPTY], (c*SQUARESIZE, r*SQUARESIZE))
+    return grid, tiles
+
+def cell_rect(row, col):
+    # row 0 is the bottom row of the board array
+    return pygame.Rect(col*SQUARESIZE + X_OFFSET, height - (row+1)*SQUARESIZE, SQUARESIZE, SQUARESIZE)
+
+def draw_piece(row, col, piece):
+    """Blits one piece; returns the rectangle to update."""
+    rect = cell_rect(row, col)
+    screen.blit(piece_tiles[piece], rect)
+    return rect
+
+def render_castles(clear=False):
+    if current_game_mode != "CONQUER":
+        return
+    if clear:
+        # tower counts changed - the old images must not show through
+        for panel in CASTLE_PANELS:
+            screen.blit(game_bg_image, panel, panel)
+    if castles_loaded:
+        screen.blit(red_castles[p1_towers], (5, height - CASTLE_HEIGHT - 10))
+        screen.blit(yellow_castles[p2_towers], (width - CASTLE_WIDTH - 5, height - CASTLE_HEIGHT - 10))
+    else:
+        # Fallback if images fail to load
+        opponent_short = "AI" if current_match_type == "PVE" else "P2"
+        p1_txt = top_button_font.render(f"P1: {p1_towers}", 1, RED)
+        p2_txt = top_button_font.render(f"{opponent_short}: {p2_towers}", 1, YELLOW)
+        screen.blit(p1_txt, (20, height/2))
+        screen.blit(p2_txt, (width - X_OFFSET + 20, height/2))
+
+def render_board(board):
+    """Grid, pieces and castles onto the screen, without updating the display."""
+    screen.blit(board_surface, BOARD_RECT)
+    screen.blits([(piece_tiles[int(board[r][c])], cell_rect(r, c))
+                  for r in range(ROW_COUNT) for c in range(COLUMN_COUNT) if board[r][c] != EMPTY], False)
+    render_castles()
+
+def draw_board(board):
+    render_board(board)
+    present()
 
-    pygame.display.update()
+def draw_thinking_indicator():
+    dots = "." * (1 + (pygame.time.get_ticks() // 400) % 3)
+    screen.blit(game_bg_image, (0,0), (0, 0, width, SQUARESIZE))
+    label = render_text(top_button_font, f"AI is thinking{dots}", YELLOW)
+    screen.blit(label, (width/2 - label.get_width()/2, SQUARESIZE/2 - label.get_height()/2))
+    present([HOVER_RECT])
+
+# -------------------------------------------------------------------
+# TEXT & BUTTON CACHE
+# Menu frames re-use what they drew before instead of allocating:
+# rendered text (keyed by font, string and color), finished button
+# surfaces (normal and hover) and the dimming overlay. The text and
+# button caches are LRU-bounded by RENDER_CACHE_SIZE since value labels
+# ("Music Volume: 40%", "AI is thinking..") keep producing new strings.
+# -------------------------------------------------------------------
+RENDER_CACHE_SIZE = 128
+
+class SurfaceCache:
+    """Least-recently-used cache of surfaces built on first use."""
+
+    def __init__(self, max_size=RENDER_CACHE_SIZE):
+        self.max_size = max_size
+        self.entries = OrderedDict()
+
+    def get(self, key, build):
+        if key in self.entries:
+            self.entries.move_to_end(key)
+            return self.entries[key]
+        value = self.entries[key] = build()
+        if len(self.entries) > self.max_size:
+            self.entries.popitem(last=False)
+        return value
+
+text_cache = SurfaceCache()
+button_cache = SurfaceCache()
+overlays = {}
+
+def render_text(font, text, color):
+    """font.render(text, 1, color), rendered once per (font, text, color)."""
+    return text_cache.get((font, text, color), lambda: font.render(text, 1, color))
+
+def dim_overlay():
+    """The translucent black layer over menu backgrounds, one per screen size."""
+    size = screen.get_size()
+    if size not in overlays:
+        overlay = pygame.Surface(size, pygame.SRCALPHA)
+        overlay.fill((0, 0, 0, 160)) # The value of 160 is transparent (0= full transparent, 255=pitch black)
+        overlays[size] = overlay
+    return overlays[size]
+
+def build_button(text, font, rect, fill, text_color, hovered):
+    # the hover frame is 4px wider on each side; large glyphs ("<" in menu_font) may stick out of it
+    frame = rect.inflate(8, 8) if hovered else rect
+    rendered_text = render_text(font, text, text_color)
+    text_pos = (int(rect.x + rect.width/2 - rendered_text.get_width()/2), int(rect.y + rect.height/2 - rendered_text.get_height()/2))
+    area = frame.union(rendered_text.get_rect(topleft=text_pos))
+    button = pygame.Surface(area.size, pygame.SRCALPHA)
+    # transparent pixels in the text color keep antialiased edges that leave the frame exact
+    button.fill((*text_color, 0))
+    pygame.draw.rect(button, fill, frame.move(-area.x, -area.y), border_radius=10)
+    button.blit(rendered_text, (text_pos[0] - area.x, text_pos[1] - area.y))
+    return button, area.topleft
+
+# buttons drawn since the last screen redraw, for hover detection in view_signature()
+drawn_buttons = []
 
 def draw_button_with_hover(surface, text, font, rect_vals, color, hover_color, text_color):
     mx, my = pygame.mouse.get_pos()
     rect = pygame.Rect(rect_vals)
-    if rect.collidepoint((mx, my)):
-        pygame.draw.rect(surface, hover_color, rect.inflate(8, 8), border_radius=10)
-    else:
-        pygame.draw.rect(surface, color, rect, border_radius=10)
-    rendered_text = font.render(text, 1, text_color)
-    surface.blit(rendered_text, (rect.x + rect.width/2 - rendered_text.get_width()/2, rect.y + rect.height/2 - rendered_text.get_height()/2))
+    drawn_buttons.append(rect)
+    draw_button(surface, text, font, rect, color, hover_color, text_color, rect.collidepoint((mx, my)))
+
+# -------------------------------------------------------------------
+# FRAME PACING
+# The main loop sleeps in pygame.event.wait() while nothing on screen
+# moves (only the AI's thinking indicator animates). Menu-like screens
+# (see STATIC SCREEN LAYERS) are redrawn only when view_signature()
+# changes: state, the values they show, the hovered button or the
+# window mode. MAX_FPS caps how many frames a burst of events (mouse
+# motion) turns into; CONNECT4_MAX_FPS overrides it.
+# -------------------------------------------------------------------
+MAX_FPS = int(os.environ.get("CONNECT4_MAX_FPS", "60"))
+
+# -------------------------------------------------------------------
+# STATIC SCREEN LAYERS
+# Most of a menu-like screen never changes: the background, the dimming
+# overlay, the titles and the buttons in their normal look. They are
+# composed once per screen into a copy of the display (static_layer)
+# and a frame is that layer plus the hovered button and the value
+# labels. invalidate_static_layers() drops the layers when the
+# backgrounds are rescaled (F11) or a setting drawn into one changes;
+# the PAUSED layer shows the board and is rebuilt on every pause.
+# -------------------------------------------------------------------
+static_layers = {}
+
+def invalidate_static_layers(*states):
+    """Drops the layers of states (all of them when none are given)."""
+    for state in states or list(static_layers):
+        static_layers.pop(state, None)
+
+def draw_button(surface, text, font, rect_vals, color, hover_color, text_color, hovered=False):
+    rect = pygame.Rect(rect_vals)
+    fill = hover_color if hovered else color
+    surface.blit(*button_cache.get((text, font, tuple(rect), fill, text_color, hovered),
+                                   lambda: build_button(text, font, rect, fill, text_color, hovered)))
+
+def draw_shaded_title(text, y):
+    title_shadow = render_text(menu_font, text, BLACK)
+    screen.blit(title_shadow, (width/2 - title_shadow.get_width()/2 + 4, y + 4))
+    title = render_text(menu_font, text, YELLOW)
+    screen.blit(title, (width/2 - title.get_width()/2, y))
+
+def draw_centered_label(text, y):
+    label = render_text(button_font, text, WHITE)
+    screen.blit(label, (width/2 - label.get_width()/2, y))
+
+# --- MAIN MENU ---
+def paint_menu():
+    screen.blit(bg_image , (0,0))
+
+def menu_buttons():
+    # Fixed sizes for buttons
+    return [("PLAY", button_font, (width/2 - 100, 200, 200, 60), RED, (255, 100, 100), BLACK),
+            ("SETTINGS", button_font, (width/2 - 100, 290, 200, 60), YELLOW, (255, 255, 150), BLACK),
+            ("ABOUT", button_font, (width/2 - 100, 380, 200, 60), BLUE, (100, 100, 255), BLACK),
+            ("QUIT", button_font, (width/2 - 100, 470, 200, 60), (100, 100, 100), (150, 150, 150), BLACK)]
+
+# --- GAME SETUP ---
+def paint_setup():
+    screen.blit(bg_image , (0,0))
+    screen.blit(dim_overlay(), (0, 0))
+    draw_shaded_title("GAME SETUP", 60)
+
+def setup_buttons():
+    return [# --- MODE SELECTION ---
+            ("<", menu_font, (width/2 - 150, 220, 60, 60), YELLOW, (255, 255, 150), BLACK),
+            (">", menu_font, (width/2 + 90, 220, 60, 60), YELLOW, (255, 255, 150), BLACK),
+            # --- MATCH TYPE SELECTION ---
+            ("<", menu_font, (width/2 - 150, 380, 60, 60), YELLOW, (255, 255, 150), BLACK),
+            (">", menu_font, (width/2 + 90, 380, 60, 60), YELLOW, (255, 255, 150), BLACK),
+            # --- START & BACK BUTTONS ---
+            ("START BATTLE", button_font, (width/2 - 150, 500, 300, 60), GREEN, (50, 255, 50), BLACK),
+            ("BACK", button_font, (width/2 - 100, 580, 200, 60), RED, (255, 100, 100), BLACK)]
+
+def draw_setup_values():
+    draw_centered_label(f"MODE: {current_game_mode}", 170)
+    draw_centered_label(f"MATCH: {current_match_type}", 330)
+
+# --- SETTINGS ---
+def paint_settings():
+    screen.blit(bg_image , (0,0))
+    screen.blit(dim_overlay(), (0, 0))
+    draw_shaded_title("SETTINGS", 30)
+
+def settings_buttons():
+    # the pause button's look follows is_music_paused (the layer is invalidated on every settings click)
+    pp_color = BLACK if not is_music_paused else GREEN
+    pp_hover = (50, 50, 50) if not is_music_paused else (50, 255, 50)
+    pp_text_str = "PAUSE" if not is_music_paused else "CONTINUE"
+    pp_text_color = WHITE if not is_music_paused else BLACK
+    return [# --- VOLUME SETTINGS ---
+            ("-", menu_font, (width/2 - 100, 150, 60, 60), BLUE, (100, 100, 255), BLACK),
+            ("+", menu_font, (width/2 + 40, 150, 60, 60), BLUE, (100, 100, 255), BLACK),
+            # --- TRACK SETTINGS ---
+            ("<", menu_font, (width/2 - 100, 280, 60, 60), YELLOW, (255, 255, 150), BLACK),
+            (">", menu_font, (width/2 + 40, 280, 60, 60), YELLOW, (255, 255, 150), BLACK),
+            # --- PAUSE BUTTON ---
+            (pp_text_str, button_font, (width/2 - 100, 360, 200, 60), pp_color, pp_hover, pp_text_color),
+            # --- AI LEVEL SETTINGS ---
+            ("<", menu_font, (width/2 - 100, 490, 60, 60), YELLOW, (255, 255, 150), BLACK),
+            (">", menu_font, (width/2 + 40, 490, 60, 60), YELLOW, (255, 255, 150), BLACK),
+            # --- BACK BUTTON ---
+            ("BACK", button_font, (width/2 - 100, 580, 200, 60), RED, (255, 100, 100), BLACK)]
+
+def draw_settings_values():
+    draw_centered_label(f"Music Volume: {int(volume_level*100)}%", 110)
+    draw_centered_label(f"Track: {current_track_index + 1} / {len(playlist)}", 240)
+    draw_centered_label(f"AI Level: {DIFFICULTY_LEVELS[current_difficulty]['label']}", 450)
+
+# --- ABOUT ---
+def paint_about():
+    screen.blit(about_bg_image, (0,0))
+
+def about_buttons():
+    # Back button - at the bottom
+    return [("BACK", button_font, (width/2 - 100, height - 100, 200, 60), RED, (255, 100, 100), BLACK)]
+
+# --- PAUSED ---
+def paint_paused():
+    screen.blit(game_bg_image, (0,0))
+    render_board(board)
+    screen.blit(dim_overlay(), (0, 0))
+    draw_shaded_title("PAUSED", 150)
+
+def paused_buttons():
+    return [("CONTINUE", button_font, (width/2 - 150, 300, 300, 60), GREEN, (50, 255, 50), BLACK),
+            ("MAIN MENU", button_font, (width/2 - 150, 390, 300, 60), RED, (255, 100, 100), BLACK)]
+
+# --- QUIT CONFIRMATION ---
+def paint_quit_confirm():
+    screen.blit(bg_image , (0,0))
+    screen.blit(dim_overlay(), (0, 0))
+
+    # Question text
+    question = render_text(menu_font, "QUIT THE GAME?", YELLOW)
+    screen.blit(question, (width/2 - question.get_width()/2, 200))
+
+def quit_confirm_buttons():
+    # YES Button (Green), NO Button (Red)
+    return [("YES", button_font, (width/2 - 150, 350, 120, 60), (0, 200, 0), (50, 255, 50), BLACK),
+            ("NO", button_font, (width/2 + 30, 350, 120, 60), RED, (255, 100, 100), BLACK)]
+
+def no_values():
+    pass
+
+# state -> (static painter, button list, value labels)
+SCREENS = {
+    "MENU": (paint_menu, menu_buttons, no_values),
+    "SETUP": (paint_setup, setup_buttons, draw_setup_values),
+    "SETTINGS": (paint_settings, settings_buttons, draw_settings_values),
+    "ABOUT": (paint_about, about_buttons, no_values),
+    "PAUSED": (paint_paused, paused_buttons, no_values),
+    "QUIT_CONFIRM": (paint_quit_confirm, quit_confirm_buttons, no_values),
+}
+
+def static_layer(state):
+    if state not in static_layers:
+        # composed on the screen itself - the frame drawn next covers it anyway
+        paint, buttons, _ = SCREENS[state]
+        paint()
+        for button in buttons():
+            draw_button(screen, *button)
+        static_layers[state] = screen.copy()
+    return static_layers[state]
+
+def draw_screen(state):
+    """One frame of a menu-like screen: its static layer, the hovered button and the value labels."""
+    _, buttons, draw_values = SCREENS[state]
+    screen.blit(static_layer(state), (0, 0))
+    mouse = pygame.mouse.get_pos()
+    for button in buttons():
+        rect = pygame.Rect(button[2])
+        drawn_buttons.append(rect)
+        if rect.collidepoint(mouse):
+            draw_button(screen, *button, hovered=True)
+    draw_values()
+
+def draw_game_over_buttons():
+    # Rematch button - top right
+    draw_button_with_hover(screen, "REMATCH", top_button_font, (width - 130, 30, 110, 40), (0, 200, 0), (50, 255, 50), BLACK)
+
+    # Main menu button - red
+    draw_button_with_hover(screen, "MENU", top_button_font, (20, 30, 120, 40), RED, (255, 100, 100), BLACK)
+
+    # CSV save button — placed at the bottom center to avoid overlapping the win message
+    draw_button_with_hover(screen, "SAVE CSV", top_button_font, (width//2 - 60, height - 70, 120, 40), (0, 150, 200), (50, 200, 255), BLACK)
+
+
+def view_signature():
+    """Everything the current menu-like screen's look depends on."""
+    mouse = pygame.mouse.get_pos()
+    hovered = tuple(rect.collidepoint(mouse) for rect in drawn_buttons)
+    return (state, fullscreen, game_over, current_game_mode, current_match_type, volume_level,
+            current_track_index, is_music_paused, current_difficulty, hovered)
+
+def ai_to_move():
+    return state == "PLAYING" and turn == AI and not game_over and current_match_type == "PVE"
+
+# -------------------------------------------------------------------
+# INTRO VIDEO
+# A decoder thread reads, converts and scales the frames into a bounded
+# queue, so the render loop only blits (pygame.image.frombuffer on the
+# frame array itself - no tobytes copy). Playback follows the voice
+# track: frame i is shown at i / fps seconds of
+# pygame.mixer.music.get_pos(), and frames that are already late are
+# dropped instead of drifting behind the audio. Without a voice track
+# (or after it ends) the wall clock takes over.
+# -------------------------------------------------------------------
+INTRO_QUEUE_FRAMES = 8
+
+class IntroVideoDecoder:
+    """Decodes cap on a worker thread into frames: (index, RGB array) items, None at the end."""
+
+    def __init__(self, cap, frame_size, max_frames=INTRO_QUEUE_FRAMES):
+        self.cap = cap
+        self.frame_size = frame_size  # set by the render loop (F11)
+        self.frames = queue.Queue(max_frames)
+        self.stop_event = threading.Event()
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+
+    def _put(self, item):
+        # a full queue blocks the decoder, but never past stop()
+        while not self.stop_event.is_set():
+            try:
+                self.frames.put(item, timeout=0.1)
+                return
+            except queue.Full:
+                pass
+
+    def _run(self):
+        index = 0
+        while not self.stop_event.is_set():
+            ret, frame = self.cap.read()
+            if not ret:
+                break
+            frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+            frame = cv2.resize(frame, self.frame_size)
+            self._put((index, frame))
+            index += 1
+        self._put(None)
+
+    def stop(self):
+        self.stop_event.set()
+        self.thread.join()
+        self.cap.release()
+
+def intro_frame_size():
+    if fullscreen:
+        info = pygame.display.Info()
+        return (info.current_w, info.current_h)
+    return (width, height)
 
 def play_intro_video(video_path):
     global fullscreen, screen, bg_image, game_bg_image, about_bg_image
@@ -543,39 +783,37 @@ def play_intro_video(video_path):
     fps = cap.get(cv2.CAP_PROP_FPS)
     if fps == 0:
         fps = 30
-    clock = pygame.time.Clock()
+
+    # Decoding starts before the voice so the first frames are ready on time
+    decoder = IntroVideoDecoder(cap, intro_frame_size())
 
     # Playing voice file with pygame
+    has_voice = True
     try:
         pygame.mixer.music.load("videos/intro_voice.ogg")
         pygame.mixer.music.play()
     except Exception as e:
+        has_voice = False
         print(f"Video voice is not available: {e}")
 
-    while cap.isOpened():
-        ret, frame = cap.read()
-        
-        # Break loop if video is over
-        if not ret:
-            break
-
-        frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-        
-        if fullscreen:
-            info = pygame.display.Info()
-            frame = cv2.resize(frame, (info.current_w, info.current_h))
-        else:
-            frame = cv2.resize(frame, (width, height))
-            
-        surf = pygame.image.frombuffer(frame.tobytes(), frame.shape[1::-1], "RGB")
-        
-        screen.blit(surf, (0, 0))
-        pygame.display.update()
-
+    # playback position in seconds: the voice's while it plays, then the wall clock
+    clock_base, clock_started = 0.0, time.perf_counter()
+    def playback_position():
+        nonlocal clock_base, clock_started
+        voice_ms = pygame.mixer.music.get_pos() if has_voice else -1
+        if voice_ms >= 0:
+            clock_base, clock_started = voice_ms / 1000, time.perf_counter()
+            return clock_base
+        return clock_base + time.perf_counter() - clock_started
+
+    next_frame = None
+    finished = False
+    shown = dropped = 0
+    while True:
         skip_video = False
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
-                cap.release()
+                decoder.stop()
                 sys.exit()
             if event.type == pygame.KEYDOWN:
                 if event.key in [pygame.K_ESCAPE, pygame.K_SPACE, pygame.K_RETURN]:
@@ -595,6 +833,7 @@ def play_intro_video(video_path):
                         bg_image = pygame.transform.smoothscale(original_bg_image, (width,height))
                         game_bg_image = pygame.transform.smoothscale(original_game_bg_image, (width,height))
                         about_bg_image = pygame.transform.smoothscale(original_about_bg_image, (width,height))
+                    decoder.frame_size = intro_frame_size()
             if event.type == pygame.MOUSEBUTTONDOWN:
                 skip_video = True
                 break
@@ -604,9 +843,48 @@ def play_intro_video(video_path):
             pygame.mixer.music.stop()
             break
 
-        clock.tick(fps)
+        # Take every frame that is due - only the latest is shown, the older ones are dropped
+        due = int(playback_position() * fps)
+        frame = None
+        while not finished:
+            if next_frame is None:
+                try:
+                    next_frame = decoder.frames.get_nowait()
+                except queue.Empty:
+                    break
+                if next_frame is None:
+                    finished = True
+                    break
+            if next_frame[0] > due:
+                break
+            if frame is not None:
+                dropped += 1
+            frame = next_frame[1]
+            next_frame = None
+
+        # Break loop if video is over
+        if finished and frame is None:
+            break
 
-    cap.release()
+        if frame is not None:
+            if frame.shape[1::-1] != decoder.frame_size:
+                # decoded before an F11 toggle
+                frame = cv2.resize(frame, decoder.frame_size)
+            surf = pygame.image.frombuffer(frame, frame.shape[1::-1], "RGB")
+            screen.blit(surf, (0, 0))
+            present()
+            shown += 1
+
+        # Sleep until the next frame is due (or briefly, while the decoder catches up)
+        if next_frame is not None:
+            wait_ms = (next_frame[0] / fps - playback_position()) * 1000
+            pygame.time.wait(int(min(max(wait_ms, 1), 1000 / fps)))
+        else:
+            pygame.time.wait(2)
+
+    decoder.stop()
+    if frame_timer.enabled:
+        print(f"[INTRO] {shown} frames shown, {dropped} dropped to keep up with the voice")
     # Stop music when intro is over
     pygame.mixer.music.stop()
 
@@ -703,10 +981,15 @@ except:
     castles_loaded = False
     print("Castle images missing, using fallback UI.")
 
+# Cached empty grid and piece tiles (see BOARD RENDERING)
+board_surface, piece_tiles = build_board_surfaces()
+
 # Variables initialized manually
 board = create_board()
 game_over = False
 turn = random.randint(PLAYER, AI)
+frame_clock = pygame.time.Clock()
+last_view = None
 
 # 1. Play intro
 play_intro_video("videos/intro_video.mp4")
@@ -726,10 +1009,22 @@ except pygame.error as e:
 while True: # Infinity loop structure
     #FSM - State Management Mechanism
 
-    for event in pygame.event.get():
+    # Only the thinking indicator animates - otherwise sleep until the next event
+    if ai_job is not None or ai_to_move():
+        events = pygame.event.get()
+    else:
+        events = [pygame.event.wait()] + pygame.event.get()
+    frame_timer.start()
+    hover_x = None
+
+    for event in events:
         if event.type == pygame.QUIT:
             sys.exit()
 
+        # The window content was lost - menu screens must be drawn again
+        if event.type == pygame.WINDOWEXPOSED:
+            last_view = None
+
         if event.type == MUSIC_END:
             current_track_index = (current_track_index + 1) % len(playlist)
             pygame.mixer.music.load(playlist[current_track_index])
@@ -752,19 +1047,18 @@ while True: # Infinity loop structure
                     about_bg_image = pygame.transform.smoothscale(original_about_bg_image, (width,height))
                 
                 # Update and adapt to matrix belonging to screen changing
+                # (menu screens follow through view_signature, from rebuilt layers)
+                invalidate_static_layers()
                 if state == "PLAYING" or state == "PAUSED":
                     screen.blit(game_bg_image, (0,0))
                     draw_board(board)
-                    pygame.display.update()
-                elif state == "ABOUT":
-                    screen.blit(about_bg_image, (0,0))
-                    pygame.display.update()
             
             # ESC logic for Pausing
             if event.key == pygame.K_ESCAPE:
                 if state == "PLAYING" and not game_over:
                     if click_sound: click_sound.play()
                     state = "PAUSED"
+                    invalidate_static_layers("PAUSED")
                 elif state == "PAUSED":
                     if click_sound: click_sound.play()
                     state = "PLAYING"
@@ -773,16 +1067,6 @@ while True: # Infinity loop structure
 
         # State 1 : Main menu
         if state == "MENU":
-            screen.blit(bg_image , (0,0))
-            
-            # Fixed sizes for buttons
-            draw_button_with_hover(screen, "PLAY", button_font, (width/2 - 100, 200, 200, 60), RED, (255, 100, 100), BLACK)
-            draw_button_with_hover(screen, "SETTINGS", button_font, (width/2 - 100, 290, 200, 60), YELLOW, (255, 255, 150), BLACK)
-            draw_button_with_hover(screen, "ABOUT", button_font, (width/2 - 100, 380, 200, 60), BLUE, (100, 100, 255), BLACK)
-            draw_button_with_hover(screen, "QUIT", button_font, (width/2 - 100, 470, 200, 60), (100, 100, 100), (150, 150, 150), BLACK)
-            
-            pygame.display.update()
-
             if event.type == pygame.MOUSEBUTTONDOWN:
                 posx, posy = event.pos
                 if (width/2 - 100 <= posx <= width/2 + 100):
@@ -801,35 +1085,6 @@ while True: # Infinity loop structure
 
         # State 1.5 : Game Setup
         elif state == "SETUP":
-            screen.blit(bg_image , (0,0))
-            
-            overlay = pygame.Surface((width, height), pygame.SRCALPHA)
-            overlay.fill((0, 0, 0, 160)) 
-            screen.blit(overlay, (0, 0))
-            
-            title_shadow = menu_font.render("GAME SETUP", 1, BLACK)
-            screen.blit(title_shadow, (width/2 - title_shadow.get_width()/2 + 4, 64))
-            title = menu_font.render("GAME SETUP", 1, YELLOW)
-            screen.blit(title, (width/2 - title.get_width()/2, 60))
-            
-            # --- MODE SELECTION ---
-            mode_text = button_font.render(f"MODE: {current_game_mode}", 1, WHITE)
-            screen.blit(mode_text, (width/2 - mode_text.get_width()/2, 170))
-            draw_button_with_hover(screen, "<", menu_font, (width/2 - 150, 220, 60, 60), YELLOW, (255, 255, 150), BLACK)
-            draw_button_with_hover(screen, ">", menu_font, (width/2 + 90, 220, 60, 60), YELLOW, (255, 255, 150), BLACK)
-
-            # --- MATCH TYPE SELECTION ---
-            match_text = button_font.render(f"MATCH: {current_match_type}", 1, WHITE)
-            screen.blit(match_text, (width/2 - match_text.get_width()/2, 330))
-            draw_button_with_hover(screen, "<", menu_font, (width/2 - 150, 380, 60, 60), YELLOW, (255, 255, 150), BLACK)
-            draw_button_with_hover(screen, ">", menu_font, (width/2 + 90, 380, 60, 60), YELLOW, (255, 255, 150), BLACK)
-
-            # --- START & BACK BUTTONS ---
-            draw_button_with_hover(screen, "START BATTLE", button_font, (width/2 - 150, 500, 300, 60), GREEN, (50, 255, 50), BLACK)
-            draw_button_with_hover(screen, "BACK", button_font, (width/2 - 100, 580, 200, 60), RED, (255, 100, 100), BLACK)
-            
-            pygame.display.update()
-
             if event.type == pygame.MOUSEBUTTONDOWN:
                 posx, posy = event.pos
                 # Mode Logic
@@ -866,54 +1121,10 @@ while True: # Infinity loop structure
 
         # State 2 : Settings part
         elif state == "SETTINGS":
-            screen.blit(bg_image , (0,0))
-            
-            # Dimming overlay
-            overlay = pygame.Surface((width, height), pygame.SRCALPHA)
-            overlay.fill((0, 0, 0, 160)) # The value of 160 is transparent (0= full transparent, 255=pitch black)
-            screen.blit(overlay, (0, 0))
-            
-            # Shaded title
-            title_shadow = menu_font.render("SETTINGS", 1, BLACK)
-            screen.blit(title_shadow, (width/2 - title_shadow.get_width()/2 + 4, 34))
-            title = menu_font.render("SETTINGS", 1, YELLOW)
-            screen.blit(title, (width/2 - title.get_width()/2, 30))
-            
-            # --- VOLUME SETTINGS ---
-            vol_text = button_font.render(f"Music Volume: {int(volume_level*100)}%", 1, (255, 255, 255))
-            screen.blit(vol_text, (width/2 - vol_text.get_width()/2, 110))
-            
-            draw_button_with_hover(screen, "-", menu_font, (width/2 - 100, 150, 60, 60), BLUE, (100, 100, 255), BLACK)
-            draw_button_with_hover(screen, "+", menu_font, (width/2 + 40, 150, 60, 60), BLUE, (100, 100, 255), BLACK)
-
-            # --- TRACK SETTINGS ---
-            track_text = button_font.render(f"Track: {current_track_index + 1} / {len(playlist)}", 1, (255, 255, 255))
-            screen.blit(track_text, (width/2 - track_text.get_width()/2, 240))
-
-            draw_button_with_hover(screen, "<", menu_font, (width/2 - 100, 280, 60, 60), YELLOW, (255, 255, 150), BLACK)
-            draw_button_with_hover(screen, ">", menu_font, (width/2 + 40, 280, 60, 60), YELLOW, (255, 255, 150), BLACK)
-
-            # --- PAUSE BUTTON ---
-            pp_color = BLACK if not is_music_paused else GREEN
-            pp_hover = (50, 50, 50) if not is_music_paused else (50, 255, 50)
-            pp_text_str = "PAUSE" if not is_music_paused else "CONTINUE"
-            pp_text_color = WHITE if not is_music_paused else BLACK
-            draw_button_with_hover(screen, pp_text_str, button_font, (width/2 - 100, 360, 200, 60), pp_color, pp_hover, pp_text_color)
-            
-            # --- AI LEVEL SETTINGS ---
-            diff_text = button_font.render(f"AI Level: {DIFFICULTY_LEVELS[current_difficulty]['label']}", 1, (255, 255, 255))
-            screen.blit(diff_text, (width/2 - diff_text.get_width()/2, 450))
-
-            draw_button_with_hover(screen, "<", menu_font, (width/2 - 100, 490, 60, 60), YELLOW, (255, 255, 150), BLACK)
-            draw_button_with_hover(screen, ">", menu_font, (width/2 + 40, 490, 60, 60), YELLOW, (255, 255, 150), BLACK)
-
-            # --- BACK BUTTON ---
-            draw_button_with_hover(screen, "BACK", button_font, (width/2 - 100, 580, 200, 60), RED, (255, 100, 100), BLACK)
-            
-            pygame.display.update()
-
             if event.type == pygame.MOUSEBUTTONDOWN:
                 posx, posy = event.pos
+                # the pause button drawn into the SETTINGS layer may change
+                invalidate_static_layers("SETTINGS")
                 # Volume Logic
                 if (150 <= posy <= 210):
                     if (width/2 - 100 <= posx <= width/2 - 40):
@@ -969,13 +1180,6 @@ while True: # Infinity loop structure
 
         # State for ABOUT screen
         elif state == "ABOUT":
-            screen.blit(about_bg_image, (0,0))
-            
-            # Back button - at the bottom
-            draw_button_with_hover(screen, "BACK", button_font, (width/2 - 100, height - 100, 200, 60), RED, (255, 100, 100), BLACK)
-            
-            pygame.display.update()
-
             if event.type == pygame.MOUSEBUTTONDOWN:
                 posx, posy = event.pos
                 if (width/2 - 100 <= posx <= width/2 + 100) and (height - 100 <= posy <= height - 40):
@@ -986,17 +1190,6 @@ while True: # Infinity loop structure
         elif state == "PLAYING":
             # Scenario 1: Game over - wait for rematch option
             if game_over:
-                # Rematch button - top right
-                draw_button_with_hover(screen, "REMATCH", top_button_font, (width - 130, 30, 110, 40), (0, 200, 0), (50, 255, 50), BLACK)
-                
-                # Main menu button - red
-                draw_button_with_hover(screen, "MENU", top_button_font, (20, 30, 120, 40), RED, (255, 100, 100), BLACK)
-
-                # CSV save button — placed at the bottom center to avoid overlapping the win message
-                draw_button_with_hover(screen, "SAVE CSV", top_button_font, (width//2 - 60, height - 70, 120, 40), (0, 150, 200), (50, 200, 255), BLACK)
-                
-                pygame.display.update()
-
                 # Controlization for clicking the button
                 if event.type == pygame.MOUSEBUTTONDOWN:
                     posx, posy = event.pos
@@ -1009,45 +1202,38 @@ while True: # Infinity loop structure
                     # SAVE CSV button: print file path to terminal and show on-screen confirmation
                     elif (width//2 - 60 <= posx <= width//2 + 60) and (height - 70 <= posy <= height - 30):
                         if click_sound: click_sound.play()
+                        csv_sink.flush()
                         abs_csv_path = os.path.abspath(CONTINUOUS_CSV_FILE)
                         print(f"\n[CSV SAVE] Continuous data file: {abs_csv_path}")
                         print(f"[CSV SAVE] Total rows recorded (excluding header): {session_stats['total_moves']}")
                         # Show a brief on-screen confirmation message near the button
                         csv_msg = top_button_font.render(f"Saved: {CONTINUOUS_CSV_FILE}", 1, (0, 255, 200))
                         screen.blit(csv_msg, (width//2 - csv_msg.get_width()//2, height - 115))
-                        pygame.display.update()
+                        present()
                         pygame.time.wait(2000)
                 continue # Skip the loop for other playing processes
 
             # Scenario 2: The game is going on (classic gameplay)
+            # only the last mouse position of the frame is drawn (after the event loop)
             if event.type == pygame.MOUSEMOTION:
-                screen.blit(game_bg_image, (0,0), (0, 0, width, SQUARESIZE))
-                posx = event.pos[0]
-                
-                # Constrain visual piece within board area
-                if posx < X_OFFSET: posx = X_OFFSET
-                if posx > width - X_OFFSET: posx = width - X_OFFSET
-                
-                if turn == PLAYER:
-                    pygame.draw.circle(screen, RED, (posx, int(SQUARESIZE/2)), RADIUS)
-                elif turn == AI and current_match_type == "PVP":
-                    pygame.draw.circle(screen, YELLOW, (posx, int(SQUARESIZE/2)), RADIUS)
-                    
-            pygame.display.update()
+                hover_x = event.pos[0]
 
             if event.type == pygame.MOUSEBUTTONDOWN:
                 if turn == PLAYER or (turn == AI and current_match_type == "PVP"):
                     posx = event.pos[0]
                     
                     if X_OFFSET <= posx <= width - X_OFFSET:
+                        hover_x = None
                         screen.blit(game_bg_image, (0,0), (0, 0, width, SQUARESIZE))
                         col = int(math.floor((posx - X_OFFSET)/SQUARESIZE))
+                        changed = [HOVER_RECT]
 
                         if is_valid_location(board, col):
                             row = get_next_open_row(board, col)
                             active_piece = PLAYER_PIECE if turn == PLAYER else AI_PIECE
                             
                             drop_piece(board, row, col, active_piece)
+                            changed.append(draw_piece(row, col, active_piece))
                             if drop_sound:
                                 drop_sound.play() # Rock falling effect
 
@@ -1056,57 +1242,17 @@ while True: # Infinity loop structure
                             write_move_to_csv(player_label, col, None, None, board)
                             move_counter += 1
 
-                            if winning_move(board, active_piece):
+                            if winning_move_at(board, row, col, active_piece):
                                 process_win(active_piece)
                             elif len(get_valid_locations(board)) == 0:
                                 process_draw()
                             else:
                                 turn += 1
                                 turn = turn % 2
-                            draw_board(board)
+                        present(changed)
 
         # State 3.5 : Paused screen
         elif state == "PAUSED":
-            screen.blit(game_bg_image, (0,0))
-            
-            for c in range(COLUMN_COUNT):
-                for r in range(ROW_COUNT):
-                    pygame.draw.rect(screen, BLUE, (c*SQUARESIZE + X_OFFSET, r*SQUARESIZE+SQUARESIZE, SQUARESIZE, SQUARESIZE))
-                    pygame.draw.circle(screen, BLACK, (int(c*SQUARESIZE + X_OFFSET + SQUARESIZE/2), int(r*SQUARESIZE+SQUARESIZE+SQUARESIZE/2)), RADIUS)
-            
-            for c in range(COLUMN_COUNT):
-                for r in range(ROW_COUNT):      
-                    if board[r][c] == PLAYER_PIECE:
-                        pygame.draw.circle(screen, RED, (int(c*SQUARESIZE + X_OFFSET + SQUARESIZE/2), height-int(r*SQUARESIZE+SQUARESIZE/2)), RADIUS)
-                    elif board[r][c] == AI_PIECE: 
-                        pygame.draw.circle(screen, YELLOW, (int(c*SQUARESIZE + X_OFFSET + SQUARESIZE/2), height-int(r*SQUARESIZE+SQUARESIZE/2)), RADIUS)
-                        
-            if current_game_mode == "CONQUER":
-                if castles_loaded:
-                    screen.blit(red_castles[p1_towers], (5, height - CASTLE_HEIGHT - 10))
-                    screen.blit(yellow_castles[p2_towers], (width - CASTLE_WIDTH - 5, height - CASTLE_HEIGHT - 10))
-                else:
-                    opponent_short = "AI" if current_match_type == "PVE" else "P2"
-                    p1_txt = top_button_font.render(f"P1: {p1_towers}", 1, RED)
-                    p2_txt = top_button_font.render(f"{opponent_short}: {p2_towers}", 1, YELLOW)
-                    screen.blit(p1_txt, (20, height/2))
-                    screen.blit(p2_txt, (width - X_OFFSET + 20, height/2))
-
-            # Dimming overlay
-            overlay = pygame.Surface((width, height), pygame.SRCALPHA)
-            overlay.fill((0, 0, 0, 160)) 
-            screen.blit(overlay, (0, 0))
-            
-            title_shadow = menu_font.render("PAUSED", 1, BLACK)
-            screen.blit(title_shadow, (width/2 - title_shadow.get_width()/2 + 4, 154))
-            title = menu_font.render("PAUSED", 1, YELLOW)
-            screen.blit(title, (width/2 - title.get_width()/2, 150))
-            
-            draw_button_with_hover(screen, "CONTINUE", button_font, (width/2 - 150, 300, 300, 60), GREEN, (50, 255, 50), BLACK)
-            draw_button_with_hover(screen, "MAIN MENU", button_font, (width/2 - 150, 390, 300, 60), RED, (255, 100, 100), BLACK)
-            
-            pygame.display.update()
-
             if event.type == pygame.MOUSEBUTTONDOWN:
                 posx, posy = event.pos
                 if (width/2 - 150 <= posx <= width/2 + 150):
@@ -1121,25 +1267,6 @@ while True: # Infinity loop structure
 
         # State 4 : Exit confirmation screen
         elif state == "QUIT_CONFIRM":
-            screen.blit(bg_image , (0,0))
-            
-            # Dimming overlay
-            overlay = pygame.Surface((width, height), pygame.SRCALPHA)
-            overlay.fill((0, 0, 0, 160)) # The value of 160 is transparent
-            screen.blit(overlay, (0, 0))
-            
-            # Question text
-            question = menu_font.render("QUIT THE GAME?", 1, YELLOW)
-            screen.blit(question, (width/2 - question.get_width()/2, 200))
-            
-            # YES Button (Green)
-            draw_button_with_hover(screen, "YES", button_font, (width/2 - 150, 350, 120, 60), (0, 200, 0), (50, 255, 50), BLACK)
-            
-            # NO Button (Red)
-            draw_button_with_hover(screen, "NO", button_font, (width/2 + 30, 350, 120, 60), RED, (255, 100, 100), BLACK)
-            
-            pygame.display.update()
-
             if event.type == pygame.MOUSEBUTTONDOWN:
                 posx, posy = event.pos
                 # YES - Exit Game
@@ -1151,67 +1278,65 @@ while True: # Infinity loop structure
                     if click_sound: click_sound.play()
                     state = "MENU"
 
+    ai_turn = ai_to_move()
+
+    # Pausing or leaving the game cancels a running search
+    if ai_job is not None and not ai_turn:
+        cancel_ai_search()
+
     # The AI movement logic
-    if state == "PLAYING" and turn == AI and not game_over and current_match_type == "PVE":                
-        ai_depth = DIFFICULTY_LEVELS[current_difficulty]["depth"]
-        col, minimax_score = minimax(board, ai_depth, -math.inf, math.inf, True)
+    if ai_turn:
+        if ai_job is None:
+            ai_job = AISearchJob(board, DIFFICULTY_LEVELS[current_difficulty])
+        if not ai_job.done():
+            # keep pumping events at a steady frame rate while the worker searches
+            draw_thinking_indicator()
+            frame_clock.tick(THINKING_FPS)
+            continue
+
+        ai_level = ai_job.level
+        ai_move = ai_job.result
+        col, minimax_score, ai_depth, endgame, from_book, search_stats, ai_pv, root_scores = ai_move
+        ai_job = None
+        screen.blit(game_bg_image, (0,0), (0, 0, width, SQUARESIZE))
 
         if is_valid_location(board, col):
+            # --- EXPLAINABLE AI LOGIC (INCLUDED WITH LOSING STATES) ---
+            # built from the line and root scores the search returned (engine/explain.py)
+            ai_explanation = explain_move(board, ai_move, current_difficulty)
+
             row = get_next_open_row(board, col)
             drop_piece(board, row, col, AI_PIECE)
+            changed = [HOVER_RECT, draw_piece(row, col, AI_PIECE)]
             if drop_sound:
                 drop_sound.play()
 
-            # --- EXPLAINABLE AI LOGIC (INCLUDED WITH LOSING STATES) ---
-            ai_explanation = ""
-            
-            if minimax_score > 1000000:
-                ai_explanation = "AI has found a definitive winning move or successfully blocked the opponent's absolute victory!"
-                
-            elif minimax_score < -1000000:
-                # The AI sees it is going to lose definitively
-                if current_difficulty in ["EASY", "NORMAL"]:
-                    ai_explanation = f"AI ({current_difficulty}) failed to see the trap early enough. It recognizes an unavoidable defeat and makes a desperate move."
-                else:
-                    ai_explanation = "Despite its deep calculations, AI realizes the player has established an unblockable winning condition."
-                    
-            elif minimax_score <= -50:
-                # The AI is in a very bad position and forced into sub-optimal defensive moves
-                ai_explanation = f"AI is under heavy pressure (Score: {minimax_score}). It is struggling to defend against multiple player threats."
-                
-            elif minimax_score < 0:
-                # Standard defensive response
-                if current_difficulty == "EASY":
-                    ai_explanation = f"AI (EASY) lacks deep foresight and is merely reacting to the immediate threat (Score: {minimax_score})."
-                else:
-                    ai_explanation = f"AI is playing defensively (Score: {minimax_score}) to neutralize the player's upcoming threats."
-                    
-            elif col == 3: 
-                # If AI selects the exact mid column
-                ai_explanation = f"AI selected the center column (Score: {minimax_score}) to maximize future horizontal and diagonal possibilities."
-                
-            elif minimax_score > 50: 
-                # An attacking opportunity for AI
-                ai_explanation = f"AI detects a strong offensive opportunity (Score: {minimax_score}) and is building a strategic trap."
-                
-            else: 
-                # Standard steady movements
-                ai_explanation = f"AI calculated {ai_depth} steps ahead and selected column {col} for steady strategic positioning."
-
             # Terminal Printout
             print(f"\n--- [AI DECISION CENTER] Move No: {move_counter} ---")
-            print(f">> Level: {current_difficulty} (Depth: {ai_depth})")
+            budget = f", Budget: {ai_level['time_ms']} ms" if "time_ms" in ai_level else ""
+            print(f">> Level: {current_difficulty} (Depth: {ai_depth}{budget})")
             print(f">> Selected Column: {col}")
             print(f">> Minimax Calculated Score: {minimax_score}")
+            if from_book:
+                print(">> Source: Opening Book")
+            if endgame is not None:
+                print(f">> Endgame Solver: {endgame.outcome} in {endgame.distance} ({endgame.nodes} nodes)")
+            tt_stats = transposition_table.stats()
+            print(f">> Transposition Table: {tt_stats['hits']} hits / {tt_stats['misses']} misses / {tt_stats['collisions']} collisions")
+            print(f">> Search Stats: {search_stats}")
+            print(f">> Expected Line: {' '.join(map(str, ai_pv))}")
+            bounds = "exact" if endgame is not None or from_book else "upper bounds"
+            print(f">> Root Scores ({bounds}): {', '.join(f'{c}: {v}' for c, v in sorted(root_scores.items()))}")
             print(f">> AI Explanation: {ai_explanation}")
             print("-" * 50)
 
             # Log the AI move to the continuous CSV file
-            write_move_to_csv("AI_Warrior", col, minimax_score, ai_explanation, board)
+            write_move_to_csv("AI_Warrior", col, minimax_score, ai_explanation, board, ai_depth, search_stats,
+                              ai_pv, root_scores)
                 
             move_counter += 1
 
-            if winning_move(board, AI_PIECE):
+            if winning_move_at(board, row, col, AI_PIECE):
                 process_win(AI_PIECE)
             elif len(get_valid_locations(board)) == 0:
                 process_draw()
@@ -1219,4 +1344,35 @@ while True: # Infinity loop structure
                 turn += 1
                 turn = turn % 2
                 
-            draw_board(board)
\ No newline at end of file
+            present(changed)
+
+    # Menu-like screens (and the game-over buttons) are redrawn only when their look changed
+    if state in SCREENS or (state == "PLAYING" and game_over):
+        if view_signature() != last_view:
+            drawn_buttons.clear()
+            if state == "PLAYING":
+                draw_game_over_buttons()
+                # only the buttons change (inflated by the hover border)
+                present([rect.inflate(8, 8) for rect in drawn_buttons])
+            else:
+                draw_screen(state)
+                present()
+            last_view = view_signature()
+    else:
+        last_view = None
+
+    if hover_x is not None and state == "PLAYING" and not game_over:
+        screen.blit(game_bg_image, (0,0), (0, 0, width, SQUARESIZE))
+        posx = hover_x
+
+        # Constrain visual piece within board area
+        if posx < X_OFFSET: posx = X_OFFSET
+        if posx > width - X_OFFSET: posx = width - X_OFFSET
+
+        if turn == PLAYER:
+            pygame.draw.circle(screen, RED, (posx, int(SQUARESIZE/2)), RADIUS)
+        elif turn == AI and current_match_type == "PVP":
+            pygame.draw.circle(screen, YELLOW, (posx, int(SQUARESIZE/2)), RADIUS)
+        present([HOVER_RECT])
+
+    frame_clock.tick(MAX_FPS)
@@ -0,0 +1,30 @@
+"""
+Connect Wars search engine.
+Pure-Python / NumPy board representation and AI search, free of pygame.
+"""
+
+from .bitboard import (
+    AI_PIECE,
+    COLUMN_COUNT,
+    EMPTY,
+    PLAYER_PIECE,
+    ROW_COUNT,
+    Bitboard,
+    board_to_bitboard,
+)
+from .search import (
+    LOSS_SCORE,
+    WIN_SCORE,
+    SearchCancelled,
+    SearchLimits,
+    SearchStats,
+    SearchTimeout,
+    iterative_deepening,
+    minimax,
+    principal_variation,
+    terminal_score,
+)
+from .heuristics import bitboards_to_boards, score_batch, score_bitboards, score_position
+from .ordering import CenterOrdering, HeuristicOrdering, MoveOrdering
+from .solver import DEFAULT_SOLVER_EMPTY_CELLS, Solver, SolveResult, empty_cells
+from .transposition import TranspositionTable
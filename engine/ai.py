@@ -0,0 +1,111 @@
+import time
+from collections import namedtuple
+
+from .bitboard import AI_PIECE, PLAYER_PIECE, board_to_bitboard
+from .book import OpeningBook
+from .search import (LOSS_SCORE, WIN_SCORE, SearchLimits, SearchStats, SearchTimeout, iterative_deepening,
+                     minimax as bitboard_minimax, principal_variation, terminal_score)
+from .solver import Solver, empty_cells
+
+# -------------------------------------------------------------------
+# AI MOVE SELECTION
+# Difficulty levels and the entry points the game uses to pick the AI
+# move on a NumPy board. Everything is converted to a Bitboard and
+# searched by engine.search / engine.solver, or read from the book.
+# -------------------------------------------------------------------
+
+# AI DIFFICULTY LEVELS
+# "depth" is the deepest iteration of the search. Optional "time_ms" (wall-clock
+# budget per move) and "nodes" (node budget) stop iterative deepening earlier.
+# "solver_empty_cells" hands the game to the perfect-play endgame solver once
+# that few empty cells remain. "book" lets the level play from the opening book,
+# only from entries searched at least "depth" deep (never shallower than a live search).
+DIFFICULTY_LEVELS = {
+    "EASY": {"depth": 1, "label": "EASY"},
+    "NORMAL": {"depth": 3, "label": "MEDIUM"},
+    "HARD": {"depth": 12, "time_ms": 1500, "solver_empty_cells": 18, "book": True, "label": "HARD"}
+}
+
+# Result of search_ai_move:
+#   column, score, depth  - chosen move, its score and the depth it was searched to
+#   endgame               - the solver's SolveResult when the position was solved exactly, otherwise None
+#   from_book             - True when the move came from the opening book
+#   stats                 - SearchStats of this move (nodes, cutoffs, TT hits, time ...)
+#   pv                    - expected line starting with column, alternating AI / opponent moves
+#   root_scores           - dict column -> score of every root move searched. Only the chosen
+#                           move's score is exact after alpha-beta; the others are upper bounds
+#                           that mostly equal the chosen score, so they cannot rank the other
+#                           columns. Solver scores are exact for every column.
+AIMove = namedtuple("AIMove", "column score depth endgame from_book stats pv root_scores")
+
+# Share of the move's time/node budget the endgame solver may use. An unsolved
+# position falls back to iterative deepening, which needs the rest to get deep.
+SOLVER_BUDGET_SHARE = 0.5
+
+# Precomputed opening replies (books/opening_book.bin, built with python -m engine.book).
+# The file is memory-mapped on the first lookup, not at import.
+opening_book = OpeningBook()
+
+
+#Minimax Algorithm Implementations (w/alpha-beta pruning)
+#main decision mechanism
+#conversion layer: the search itself runs on the bitboard engine (engine/search.py)
+def minimax(board, depth, alpha, beta, maximizingPlayer, tt=None):
+    piece = AI_PIECE if maximizingPlayer else PLAYER_PIECE
+    bb = board_to_bitboard(board, piece)
+    # The search only checks the last move, so a finished root is handled here once
+    root_score = terminal_score(bb)
+    if root_score is not None:
+        return (None, root_score)
+    return bitboard_minimax(bb, depth, alpha, beta, maximizingPlayer, tt)
+
+def _solver_score(score):
+    # keep the sentinel scores so the score column stays comparable
+    return WIN_SCORE if score > 0 else LOSS_SCORE if score < 0 else 0
+
+#time/node bounded search for the AI turn - returns an AIMove
+def search_ai_move(board, level, limits=None, tt=None, book=None):
+    start = time.perf_counter()
+    stats = SearchStats()
+    if limits is None:
+        limits = SearchLimits(level.get("time_ms"), level.get("nodes"))
+    bb = board_to_bitboard(board, AI_PIECE)
+    root_score = terminal_score(bb)
+    if root_score is not None:
+        return AIMove(None, root_score, 0, None, False, stats, [], {})
+
+    # Opening replies are a lookup, no search needed
+    if level.get("book"):
+        book_move = (book if book is not None else opening_book).lookup(bb, min_depth=level["depth"])
+        if book_move is not None:
+            col, score, depth = book_move
+            stats.depth = depth
+            stats.seconds = time.perf_counter() - start
+            return AIMove(col, score, depth, None, True, stats, [col], {col: score})
+
+    solver_threshold = level.get("solver_empty_cells")
+    if solver_threshold is not None and empty_cells(bb) <= solver_threshold:
+        solver_limits = limits.split(SOLVER_BUDGET_SHARE)
+        solver = Solver(solver_limits)
+        try:
+            solved = solver.best_move(bb.copy())
+        except SearchTimeout:
+            solved = None  # its share used up - fall back to the heuristic search
+        stats.add_limits(solver_limits)
+        if solved is not None:
+            stats.depth = empty_cells(bb)
+            stats.seconds = time.perf_counter() - start
+            root_scores = {c: _solver_score(v) for c, v in solver.root_scores.items()}
+            return AIMove(solved.column, _solver_score(solved.score), empty_cells(bb), solved, False, stats,
+                          [solved.column], root_scores)
+        # the solver's nodes count against the move's node budget
+        if limits.max_nodes is not None:
+            limits.max_nodes -= solver_limits.nodes
+
+    root_scores = {}
+    col, score, depth = iterative_deepening(bb, level["depth"], level.get("time_ms"), level.get("nodes"),
+                                            tt, limits=limits, stats=stats, root_scores=root_scores)
+    # the line is read back from the table the search just filled - no extra search
+    pv = principal_variation(bb, tt, depth, best=col) if tt is not None else [col]
+    stats.seconds = time.perf_counter() - start
+    return AIMove(col, score, depth, None, False, stats, pv, root_scores)
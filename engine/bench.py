@@ -0,0 +1,221 @@
+import json
+import os
+import platform
+import sys
+import time
+
+import numpy as np
+
+from .bitboard import AI_PIECE, COLUMN_COUNT, ROW_COUNT, board_to_bitboard
+from .dataset import CONTINUOUS_CSV_FILE
+from .game import _as_side_to_move
+from .ordering import HeuristicOrdering
+from .positions import canonical, iter_positions
+from .search import SearchLimits, iterative_deepening, terminal_score
+from .transposition import TranspositionTable
+
+# -------------------------------------------------------------------
+# ENGINE BENCHMARK
+# A frozen corpus of logged positions (benchmarks/corpus.json: openings,
+# midgames and near-endgames) searched at a fixed depth. Reports nodes,
+# nodes per second, time to each depth and the best move and score per
+# position, plus the throughput of the two calls the search makes per
+# node (Bitboard.score_position, Bitboard.winning_move_at), as JSON.
+# Positions are searched through iterative_deepening itself, so the
+# numbers cover the code the game runs.
+# Every timing is the best of --repeat runs to keep scheduler noise out.
+#   python -m engine.bench --out bench.json
+#   python -m engine.bench --baseline bench.json      # exit 1 on a regression
+#   python -m engine.bench --freeze                   # rebuild the corpus from the CSV
+# -------------------------------------------------------------------
+
+BENCH_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "benchmarks")
+DEFAULT_CORPUS = os.path.join(BENCH_DIR, "corpus.json")
+DEFAULT_DEPTH = 8
+DEFAULT_THRESHOLD = 0.15
+DEFAULT_REPEAT = 3
+
+# stones on the board -> phase
+PHASES = (("opening", 0, 8), ("midgame", 9, 22), ("endgame", 23, ROW_COUNT * COLUMN_COUNT))
+POSITIONS_PER_PHASE = 8
+
+# throughput metrics compared against a baseline (higher is better)
+THROUGHPUT_METRICS = ("nodes_per_second", "bitboard_score_position_per_second", "winning_move_at_per_second")
+
+
+def freeze_corpus(csv_path=CONTINUOUS_CSV_FILE, out=DEFAULT_CORPUS, per_phase=POSITIONS_PER_PHASE):
+    """Picks per_phase unique, unfinished positions per phase, evenly spread over the log."""
+    candidates = {name: [] for name, _, _ in PHASES}
+    seen = set()
+    for record in iter_positions(csv_path):
+        key, _, _ = canonical(record.board, record.side_to_move)
+        if key in seen:
+            continue
+        seen.add(key)
+        board = _as_side_to_move(record.board, record.side_to_move)
+        if terminal_score(board_to_bitboard(board, AI_PIECE)) is not None:
+            continue
+        stones = int(np.count_nonzero(record.board))
+        for name, low, high in PHASES:
+            if low <= stones <= high:
+                candidates[name].append({
+                    "phase": name,
+                    "board_flat": ",".join(str(int(c)) for c in record.board.ravel()),
+                    "to_move": record.side_to_move,
+                    "source": f"{record.session_id}/{record.game_number}/{record.move_number}",
+                })
+    corpus = []
+    for name, _, _ in PHASES:
+        found = candidates[name]
+        step = max(1, len(found) // per_phase)
+        corpus += found[::step][:per_phase]
+    os.makedirs(os.path.dirname(out) or ".", exist_ok=True)
+    with open(out, "w", encoding="utf-8") as f:
+        json.dump(corpus, f, indent=1)
+    return corpus
+
+
+def load_corpus(path=DEFAULT_CORPUS):
+    with open(path, "r", encoding="utf-8") as f:
+        corpus = json.load(f)
+    for entry in corpus:
+        board = np.array(entry["board_flat"].split(","), dtype=np.float64).reshape(ROW_COUNT, COLUMN_COUNT)
+        entry["bitboard"] = board_to_bitboard(_as_side_to_move(board, entry["to_move"]), AI_PIECE)
+    return corpus
+
+
+def search_position(bb, depth):
+    """Iterative deepening to a fixed depth (no time budget). Returns the per-position result dict."""
+    limits = SearchLimits()
+    iteration_times = []
+    start = time.perf_counter()
+    column, score, reached = iterative_deepening(bb, depth, tt=TranspositionTable(), ordering=HeuristicOrdering(),
+                                                 limits=limits, iteration_times=iteration_times)
+    elapsed = time.perf_counter() - start
+    return {
+        "best_move": column,
+        "score": score,
+        "depth": reached,
+        "nodes": limits.nodes,
+        "seconds": round(elapsed, 6),
+        "nodes_per_second": round(limits.nodes / elapsed) if elapsed else 0,
+        "time_to_depth": [round(t, 6) for t in iteration_times],
+    }
+
+
+def _win_checks(corpus):
+    # (child, row, col, mover) for every legal move - what the search checks after each drop
+    checks = []
+    for entry in corpus:
+        bb = entry["bitboard"]
+        for col in bb.get_valid_locations():
+            row = bb.get_next_open_row(col)
+            child = bb.copy()
+            child.drop_piece(col)
+            checks.append((child, row, col, bb.current_piece))
+    return checks
+
+
+def _calls_per_second(fn, args_list, min_seconds=0.5):
+    calls = 0
+    start = time.perf_counter()
+    while True:
+        for args in args_list:
+            fn(*args)
+        calls += len(args_list)
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_seconds:
+            return round(calls / elapsed)
+
+
+def run_benchmark(corpus, depth=DEFAULT_DEPTH, repeat=DEFAULT_REPEAT):
+    positions = []
+    for entry in corpus:
+        # the search is deterministic, only the timing differs between runs
+        result = min((search_position(entry["bitboard"], depth) for _ in range(repeat)), key=lambda r: r["seconds"])
+        result.update(phase=entry["phase"], board_flat=entry["board_flat"], to_move=entry["to_move"])
+        positions.append(result)
+
+    nodes = sum(p["nodes"] for p in positions)
+    seconds = sum(p["seconds"] for p in positions)
+    bitboards = [(entry["bitboard"], AI_PIECE) for entry in corpus]
+    win_checks = _win_checks(corpus)
+    return {
+        "depth": depth,
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "positions": positions,
+        "summary": {
+            "positions": len(positions),
+            "nodes": nodes,
+            "seconds": round(seconds, 4),
+            "nodes_per_second": round(nodes / seconds) if seconds else 0,
+            "bitboard_score_position_per_second": max(
+                _calls_per_second(lambda bb, piece: bb.score_position(piece), bitboards) for _ in range(repeat)),
+            "winning_move_at_per_second": max(
+                _calls_per_second(lambda bb, row, col, piece: bb.winning_move_at(row, col, piece), win_checks)
+                for _ in range(repeat)),
+        },
+    }
+
+
+def compare(result, baseline, threshold=DEFAULT_THRESHOLD):
+    """Returns (report lines, regressed) for result against a saved baseline."""
+    lines = []
+    regressed = False
+    for metric in THROUGHPUT_METRICS:
+        old = baseline["summary"].get(metric)
+        new = result["summary"][metric]
+        if not old:
+            continue
+        change = new / old - 1
+        status = "ok"
+        if change < -threshold:
+            status = "REGRESSION"
+            regressed = True
+        lines.append(f"  {metric:<34}: {old:>10} -> {new:>10}  ({change:+.1%})  {status}")
+    if baseline.get("depth") == result["depth"]:
+        old_moves = [(p["best_move"], p["score"]) for p in baseline["positions"]]
+        new_moves = [(p["best_move"], p["score"]) for p in result["positions"]]
+        changed = sum(1 for a, b in zip(old_moves, new_moves) if a != b)
+        lines.append(f"  {'best move / score changed':<34}: {changed} of {len(new_moves)} positions")
+    return lines, regressed
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Engine benchmark over the frozen position corpus.")
+    parser.add_argument("--corpus", default=DEFAULT_CORPUS)
+    parser.add_argument("--depth", type=int, default=DEFAULT_DEPTH)
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT, help="timing runs per measurement (best is kept)")
+    parser.add_argument("--out", help="write the JSON result here (default: stdout)")
+    parser.add_argument("--baseline", help="saved result to compare against")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="allowed throughput drop against the baseline (0.15 = 15%%)")
+    parser.add_argument("--freeze", action="store_true", help="rebuild the corpus from the gameplay CSV")
+    parser.add_argument("--csv", default=CONTINUOUS_CSV_FILE)
+    args = parser.parse_args()
+
+    if args.freeze:
+        corpus = freeze_corpus(args.csv, args.corpus)
+        print(f"[BENCH] corpus of {len(corpus)} positions written to {args.corpus}")
+        sys.exit(0)
+
+    result = run_benchmark(load_corpus(args.corpus), args.depth, args.repeat)
+    summary = result["summary"]
+    print(f"[BENCH] depth {args.depth}, {summary['positions']} positions: {summary['nodes']} nodes in "
+          f"{summary['seconds']:.2f} s = {summary['nodes_per_second']} nodes/s", file=sys.stderr)
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(result, f, indent=1)
+    else:
+        print(json.dumps(result, indent=1))
+
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        lines, regressed = compare(result, baseline, args.threshold)
+        print(f"[BENCH] against {args.baseline}:", file=sys.stderr)
+        print("\n".join(lines), file=sys.stderr)
+        sys.exit(1 if regressed else 0)
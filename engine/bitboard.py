@@ -0,0 +1,246 @@
+import random
+
+import numpy as np
+
+# -------------------------------------------------------------------
+# BITBOARD REPRESENTATION
+# The board is stored as two integers instead of a 6x7 float matrix:
+#   position -> stones of the side to move
+#   mask     -> every stone on the board
+# Each column owns ROW_COUNT + 1 bits (one sentinel bit on top), so the
+# cell (row, col) lives at bit index col * H1 + row. Row 0 is the bottom
+# row, exactly like the NumPy board used by the pygame loop.
+# -------------------------------------------------------------------
+
+ROW_COUNT = 6
+COLUMN_COUNT = 7
+
+EMPTY = 0
+PLAYER_PIECE = 1
+AI_PIECE = 2
+
+WINDOW_LENGTH = 4
+
+H1 = ROW_COUNT + 1  # bits per column (including the sentinel bit)
+
+BOTTOM_MASK = sum(1 << (c * H1) for c in range(COLUMN_COUNT))
+BOARD_MASK = BOTTOM_MASK * ((1 << ROW_COUNT) - 1)
+CENTER_MASK = ((1 << ROW_COUNT) - 1) << ((COLUMN_COUNT // 2) * H1)
+
+# popcount fallback for interpreters older than 3.10
+try:
+    popcount = int.bit_count
+except AttributeError:  # pragma: no cover
+    def popcount(x):
+        return bin(x).count("1")
+
+
+# Zobrist keys: one random 64-bit number per (piece, bit index) plus one for
+# the side to move. A fixed seed keeps hashes stable between runs.
+_zobrist_rng = random.Random(20260418)
+ZOBRIST = {
+    piece: [_zobrist_rng.getrandbits(64) for _ in range(COLUMN_COUNT * H1)]
+    for piece in (PLAYER_PIECE, AI_PIECE)
+}
+ZOBRIST_SIDE = _zobrist_rng.getrandbits(64)
+
+
+def cell_bit(row, col):
+    return 1 << (col * H1 + row)
+
+
+def other_piece(piece):
+    return AI_PIECE if piece == PLAYER_PIECE else PLAYER_PIECE
+
+
+def _build_window_masks():
+    #all 69 winning lines as 4-bit masks - same scan order as score_position
+    windows = []
+    # Horizontal
+    for r in range(ROW_COUNT):
+        for c in range(COLUMN_COUNT - 3):
+            windows.append(sum(cell_bit(r, c + i) for i in range(WINDOW_LENGTH)))
+    # Vertical
+    for c in range(COLUMN_COUNT):
+        for r in range(ROW_COUNT - 3):
+            windows.append(sum(cell_bit(r + i, c) for i in range(WINDOW_LENGTH)))
+    # Positive sloped diagonal
+    for r in range(ROW_COUNT - 3):
+        for c in range(COLUMN_COUNT - 3):
+            windows.append(sum(cell_bit(r + i, c + i) for i in range(WINDOW_LENGTH)))
+    # Negative sloped diagonal
+    for r in range(ROW_COUNT - 3):
+        for c in range(COLUMN_COUNT - 3):
+            windows.append(sum(cell_bit(r + 3 - i, c + i) for i in range(WINDOW_LENGTH)))
+    return tuple(windows)
+
+
+WINDOW_MASKS = _build_window_masks()
+
+#winning lines passing through each cell - used for last-move win detection
+CELL_WINDOWS = {
+    (r, c): tuple(w for w in WINDOW_MASKS if w & cell_bit(r, c))
+    for r in range(ROW_COUNT) for c in range(COLUMN_COUNT)
+}
+
+
+def aligned(stones):
+    """Returns True if the given stone set contains four in a row."""
+    # Horizontal
+    m = stones & (stones >> H1)
+    if m & (m >> (2 * H1)):
+        return True
+    # Diagonal (top-left to bottom-right)
+    m = stones & (stones >> (H1 - 1))
+    if m & (m >> (2 * (H1 - 1))):
+        return True
+    # Diagonal (bottom-left to top-right)
+    m = stones & (stones >> (H1 + 1))
+    if m & (m >> (2 * (H1 + 1))):
+        return True
+    # Vertical
+    m = stones & (stones >> 1)
+    if m & (m >> 2):
+        return True
+    return False
+
+
+def evaluate_window_counts(own, opp):
+    #same weights as evaluate_window: 100 / 5 / 2 / -4
+    empty = WINDOW_LENGTH - own - opp
+    score = 0
+    if own == 4:
+        score += 100
+    elif own == 3 and empty == 1:
+        score += 5
+    elif own == 2 and empty == 2:
+        score += 2
+    if opp == 3 and empty == 1:
+        score -= 4
+    return score
+
+
+class Bitboard:
+    """
+    Connect-4 position as a (position, mask) pair plus per-column heights.
+    Moves are applied with make/unmake instead of copying the board.
+    """
+
+    __slots__ = ("position", "mask", "heights", "current_piece", "move_count", "hash")
+
+    def __init__(self, current_piece=PLAYER_PIECE):
+        self.position = 0
+        self.mask = 0
+        self.heights = [0] * COLUMN_COUNT
+        self.current_piece = current_piece
+        self.move_count = 0
+        # Zobrist hash, updated incrementally by drop_piece / undo_piece
+        self.hash = ZOBRIST_SIDE if current_piece == AI_PIECE else 0
+
+    def copy(self):
+        other = Bitboard(self.current_piece)
+        other.position = self.position
+        other.mask = self.mask
+        other.heights = self.heights[:]
+        other.move_count = self.move_count
+        other.hash = self.hash
+        return other
+
+    # --- rules (all O(1)) ---
+
+    def is_valid_location(self, col):
+        return self.heights[col] < ROW_COUNT
+
+    def get_next_open_row(self, col):
+        return self.heights[col]
+
+    def get_valid_locations(self):
+        heights = self.heights
+        return [c for c in range(COLUMN_COUNT) if heights[c] < ROW_COUNT]
+
+    def is_full(self):
+        return self.move_count == ROW_COUNT * COLUMN_COUNT
+
+    def pieces(self, piece):
+        if piece == self.current_piece:
+            return self.position
+        return self.position ^ self.mask
+
+    def winning_move(self, piece):
+        return aligned(self.pieces(piece))
+
+    def winning_move_at(self, row, col, piece):
+        """Checks only the lines through (row, col), i.e. the piece that was just dropped."""
+        stones = self.pieces(piece)
+        for window in CELL_WINDOWS[(row, col)]:
+            if stones & window == window:
+                return True
+        return False
+
+    # --- make / unmake ---
+
+    def drop_piece(self, col):
+        #the side to move drops into col, then the turn passes
+        index = col * H1 + self.heights[col]
+        self.position ^= self.mask
+        self.mask |= 1 << index
+        self.heights[col] += 1
+        self.move_count += 1
+        self.hash ^= ZOBRIST[self.current_piece][index] ^ ZOBRIST_SIDE
+        self.current_piece = other_piece(self.current_piece)
+
+    def undo_piece(self, col):
+        self.heights[col] -= 1
+        index = col * H1 + self.heights[col]
+        self.mask ^= 1 << index
+        self.position ^= self.mask
+        self.move_count -= 1
+        self.current_piece = other_piece(self.current_piece)
+        self.hash ^= ZOBRIST[self.current_piece][index] ^ ZOBRIST_SIDE
+
+    # --- heuristic ---
+
+    def score_position(self, piece):
+        """Bitboard port of score_position(board, piece); returns identical scores."""
+        own_stones = self.pieces(piece)
+        opp_stones = self.mask ^ own_stones
+        score = popcount(own_stones & CENTER_MASK) * 3
+        for window in WINDOW_MASKS:
+            own = popcount(own_stones & window)
+            opp = popcount(opp_stones & window)
+            if own or opp:
+                score += evaluate_window_counts(own, opp)
+        return score
+
+    # --- conversion layer ---
+
+    def to_board(self):
+        board = np.zeros((ROW_COUNT, COLUMN_COUNT))
+        own = self.position
+        opp = self.position ^ self.mask
+        for c in range(COLUMN_COUNT):
+            for r in range(self.heights[c]):
+                bit = cell_bit(r, c)
+                if own & bit:
+                    board[r][c] = self.current_piece
+                elif opp & bit:
+                    board[r][c] = other_piece(self.current_piece)
+        return board
+
+
+def board_to_bitboard(board, current_piece):
+    """Builds a Bitboard from the pygame loop's NumPy board; current_piece moves next."""
+    bb = Bitboard(current_piece)
+    for c in range(COLUMN_COUNT):
+        for r in range(ROW_COUNT):
+            cell = board[r][c]
+            if cell == EMPTY:
+                break
+            bit = cell_bit(r, c)
+            bb.mask |= bit
+            if cell == current_piece:
+                bb.position |= bit
+            bb.heights[c] += 1
+            bb.move_count += 1
+            bb.hash ^= ZOBRIST[int(cell)][c * H1 + r]
+    return bb
@@ -0,0 +1,103 @@
+import random
+
+import numpy as np
+
+from .bitboard import AI_PIECE, COLUMN_COUNT, PLAYER_PIECE, ROW_COUNT, WINDOW_LENGTH
+from .heuristics import score_position
+
+# -------------------------------------------------------------------
+# NUMPY BOARD RULES
+# The (ROW_COUNT, COLUMN_COUNT) array the game draws and logs. Row 0 is
+# the bottom row. The search converts it to a Bitboard; these helpers
+# are the rules the game loop (and headless code) plays by.
+# -------------------------------------------------------------------
+
+
+def create_board():
+    board = np.zeros((ROW_COUNT,COLUMN_COUNT))
+    return board
+
+def drop_piece(board, row, col, piece):
+    board[row][col] = piece
+
+def is_valid_location(board, col):
+    return board[ROW_COUNT-1][col] == 0
+
+#gravity & matrix mapping
+#drop piece synchronization
+def get_next_open_row(board, col):
+    for r in range(ROW_COUNT):
+        if board[r][col] == 0:
+            return r
+#flipping for synchronization the game board
+def print_board(board):
+    print(np.flip(board, 0))
+
+def winning_move(board, piece):
+    # Check horizontal locations for win
+    for c in range(COLUMN_COUNT-3):
+        for r in range(ROW_COUNT):
+            if board[r][c] == piece and board[r][c+1] == piece and board[r][c+2] == piece and board[r][c+3] == piece:
+                return True
+
+    # Check vertical locations for win
+    for c in range(COLUMN_COUNT):
+        for r in range(ROW_COUNT-3):
+            if board[r][c] == piece and board[r+1][c] == piece and board[r+2][c] == piece and board[r+3][c] == piece:
+                return True
+
+    # Check positively sloped diaganols
+    for c in range(COLUMN_COUNT-3):
+        for r in range(ROW_COUNT-3):
+            if board[r][c] == piece and board[r+1][c+1] == piece and board[r+2][c+2] == piece and board[r+3][c+3] == piece:
+                return True
+
+    # Check negatively sloped diaganols
+    for c in range(COLUMN_COUNT-3):
+        for r in range(3, ROW_COUNT):
+            if board[r][c] == piece and board[r-1][c+1] == piece and board[r-2][c+2] == piece and board[r-3][c+3] == piece:
+                return True
+
+    return False
+
+#incremental win check - only the lines through the piece just dropped at (row, col)
+def winning_move_at(board, row, col, piece):
+    for dr, dc in ((0, 1), (1, 0), (1, 1), (1, -1)):
+        count = 1
+        for step in (1, -1):
+            r, c = row + dr*step, col + dc*step
+            while 0 <= r < ROW_COUNT and 0 <= c < COLUMN_COUNT and board[r][c] == piece:
+                count += 1
+                r += dr*step
+                c += dc*step
+        if count >= WINDOW_LENGTH:
+            return True
+    return False
+
+#action space
+def get_valid_locations(board):
+    valid_locations = []
+    for col in range(COLUMN_COUNT):
+        if is_valid_location(board, col):
+            valid_locations.append(col)
+    return valid_locations
+
+#game is over - depends to 3 option:
+def is_terminal_node(board):
+    return winning_move(board, PLAYER_PIECE) or winning_move(board, AI_PIECE) or len(get_valid_locations(board)) == 0
+
+#fallback modular structure for basic structure of the game - depth1
+def pick_best_move(board, piece):
+    valid_locations = get_valid_locations(board)
+    best_score = -10000
+    best_col = random.choice(valid_locations)
+    for col in valid_locations:
+        row = get_next_open_row(board, col)
+        temp_board = board.copy()
+        drop_piece(temp_board, row, col, piece)
+        score = score_position(temp_board, piece)
+        if score > best_score:
+            best_score = score
+            best_col = col
+
+    return best_col
@@ -0,0 +1,179 @@
+import math
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from .bitboard import AI_PIECE, COLUMN_COUNT, EMPTY, H1, PLAYER_PIECE, Bitboard, board_to_bitboard
+from .ordering import HeuristicOrdering
+from .search import minimax
+from .transposition import TranspositionTable
+
+# -------------------------------------------------------------------
+# OPENING BOOK
+# Every position up to N plies is searched once, offline, and stored in a
+# compact binary file:
+#   8-byte magic | uint64 entry count | entries sorted by key
+#   entry = key (uint64) | best move (uint8) | depth (uint8) | score (int64)
+# The key is position + mask (unique per position, seen from the side to
+# move) folded with its mirror image, so mirrored openings share an entry.
+# At runtime the file is memory-mapped on first use and looked up with a
+# binary search.
+# Build: python -m engine.book --plies 4 --depth 12
+# -------------------------------------------------------------------
+
+BOOK_MAGIC = b"C4BOOK1\0"
+BOOK_HEADER_SIZE = 16
+BOOK_DTYPE = np.dtype([("key", "<u8"), ("move", "u1"), ("depth", "u1"), ("score", "<i8")])
+DEFAULT_BOOK_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                                 "books", "opening_book.bin")
+
+_COLUMN_MASK = (1 << H1) - 1
+
+
+def _mirror(bits):
+    mirrored = 0
+    for c in range(COLUMN_COUNT):
+        column = (bits >> (c * H1)) & _COLUMN_MASK
+        mirrored |= column << ((COLUMN_COUNT - 1 - c) * H1)
+    return mirrored
+
+
+def book_key(bb):
+    """Returns (canonical key, mirrored) - mirrored is True when the mirror image is stored."""
+    key = bb.position + bb.mask
+    mirror_key = _mirror(bb.position) + _mirror(bb.mask)
+    if mirror_key < key:
+        return mirror_key, True
+    return key, False
+
+
+class OpeningBook:
+    """Memory-mapped opening book, loaded lazily on the first lookup."""
+
+    def __init__(self, path=DEFAULT_BOOK_PATH):
+        self.path = path
+        self._entries = None
+        self._loaded = False
+
+    def _load(self):
+        self._loaded = True
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, "rb") as f:
+            header = f.read(BOOK_HEADER_SIZE)
+        if header[:8] != BOOK_MAGIC:
+            print(f"Opening book {self.path} has an unknown format, ignoring it.")
+            return
+        count = int(np.frombuffer(header[8:16], dtype="<u8")[0])
+        if count:
+            self._entries = np.memmap(self.path, dtype=BOOK_DTYPE, mode="r",
+                                      offset=BOOK_HEADER_SIZE, shape=(count,))
+
+    def __len__(self):
+        if not self._loaded:
+            self._load()
+        return 0 if self._entries is None else len(self._entries)
+
+    def lookup(self, bb, min_depth=0):
+        """
+        Returns (column, score, depth) for the side to move, or None if not in the
+        book or searched shallower than min_depth.
+        """
+        if not self._loaded:
+            self._load()
+        if self._entries is None:
+            return None
+        key, mirrored = book_key(bb)
+        keys = self._entries["key"]
+        index = int(np.searchsorted(keys, np.uint64(key)))
+        if index == len(keys) or int(keys[index]) != key:
+            return None
+        entry = self._entries[index]
+        if int(entry["depth"]) < min_depth:
+            return None
+        move = int(entry["move"])
+        if mirrored:
+            move = COLUMN_COUNT - 1 - move
+        return move, int(entry["score"]), int(entry["depth"])
+
+
+def write_book(path, entries):
+    """entries: iterable of (key, move, depth, score). Sorted and written as a book file."""
+    table = np.array(sorted(entries), dtype=BOOK_DTYPE)
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "wb") as f:
+        f.write(BOOK_MAGIC)
+        f.write(np.array([len(table)], dtype="<u8").tobytes())
+        f.write(table.tobytes())
+
+
+def _as_ai_to_move(bb):
+    #same stones, colors swapped if needed so the side to move is the AI
+    board = bb.to_board()
+    if bb.current_piece != AI_PIECE:
+        board = np.where(board == EMPTY, EMPTY, (PLAYER_PIECE + AI_PIECE) - board)
+    return board_to_bitboard(board, AI_PIECE)
+
+
+def book_positions(max_plies):
+    """Unique (mirror-folded) non-terminal positions up to max_plies, AI to move."""
+    seen = {}
+    frontier = [Bitboard(AI_PIECE)]
+    for ply in range(max_plies + 1):
+        next_frontier = []
+        for bb in frontier:
+            key, mirrored = book_key(bb)
+            if key in seen:
+                continue
+            seen[key] = bb
+            if ply == max_plies:
+                continue
+            for col in bb.get_valid_locations():
+                row = bb.get_next_open_row(col)
+                child = bb.copy()
+                child.drop_piece(col)
+                if child.winning_move_at(row, col, bb.current_piece):
+                    continue
+                # the side to move is always searched as the AI
+                next_frontier.append(_as_ai_to_move(child))
+        frontier = next_frontier
+    return list(seen.values())
+
+
+def _search_entry(args):
+    bb, depth = args
+    column, score = minimax(bb, depth, -math.inf, math.inf, True, TranspositionTable(), None, HeuristicOrdering())
+    key, mirrored = book_key(bb)
+    if mirrored:
+        column = COLUMN_COUNT - 1 - column
+    return key, column, depth, score
+
+
+def build_book(path, max_plies, depth, workers=1):
+    positions = book_positions(max_plies)
+    jobs = [(bb, depth) for bb in positions]
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            entries = list(executor.map(_search_entry, jobs, chunksize=4))
+    else:
+        entries = [_search_entry(job) for job in jobs]
+    write_book(path, entries)
+    return len(entries)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Generate the opening book offline.")
+    parser.add_argument("--plies", type=int, default=4, help="book covers positions with up to this many stones")
+    parser.add_argument("--depth", type=int, default=12, help="search depth for every book position")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--out", default=DEFAULT_BOOK_PATH)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    count = build_book(args.out, args.plies, args.depth, args.workers)
+    print(f"[BOOK] {count} positions, depth {args.depth}, written to {args.out} "
+          f"({os.path.getsize(args.out)} bytes) in {time.perf_counter() - start:.1f} s")
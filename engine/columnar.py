@@ -0,0 +1,255 @@
+import csv
+import json
+import os
+import time
+
+import numpy as np
+
+from .bitboard import COLUMN_COUNT, ROW_COUNT
+from .dataset import CONTINUOUS_CSV_FILE, CSV_RENAMED_COLUMNS
+
+# -------------------------------------------------------------------
+# COLUMNAR DATASET (NPZ)
+# The gameplay log as NumPy arrays in one .npz file instead of CSV text:
+#   boards             int8 (N, 42)  cells in board_flat order (row 0 first)
+#   <numeric column>   int / float arrays, -1 (ints) or NaN (floats) for N/A
+#   <categorical>      int32 codes + "<name>_categories" string array
+#   timestamp          datetime64[us]
+#   pv                 int8 (N, L)   principal variation, padded with -1
+#   root_score_bounds  float64 (N, 7) upper bound per root column, NaN if not searched
+#                      (exact only for the chosen column and solver moves)
+#   session_offsets    int64 (S + 1): session k is rows offsets[k]:offsets[k+1]
+# Rows are grouped by session, in order of first appearance. Loading
+# needs no string parsing and no pickle.
+# Convert: python -m engine.columnar datasets/continuous_gameplay_log.csv datasets/gameplay.npz
+# -------------------------------------------------------------------
+
+BOARD_CELLS = ROW_COUNT * COLUMN_COUNT
+
+CATEGORICAL_COLUMNS = ["session_id", "player", "match_type", "game_mode", "difficulty", "ai_explanation"]
+INT_COLUMNS = {
+    "game_number": np.int32,
+    "move_number": np.int32,
+    "chosen_column": np.int8,
+    "search_depth": np.int16,
+    "search_nodes": np.int64,
+    "leaf_evals": np.int64,
+    "beta_cutoffs": np.int64,
+    "tt_hits": np.int64,
+    "p1_towers": np.int8,
+    "p2_towers": np.int8,
+}
+FLOAT_COLUMNS = ["minimax_score", "first_move_cutoff_rate", "search_time_ms"]
+MISSING = "N/A"
+
+
+def _encode(values):
+    """Dictionary-encodes a list of strings: (int32 codes, categories)."""
+    categories = {}
+    codes = np.fromiter((categories.setdefault(v, len(categories)) for v in values), dtype=np.int32, count=len(values))
+    return codes, np.array(list(categories), dtype=str)
+
+
+def _to_int(values, dtype):
+    return np.array([int(float(v)) if v not in (MISSING, "", None) else -1 for v in values], dtype=dtype)
+
+
+def _to_float(values):
+    return np.array([float(v) if v not in (MISSING, "", None) else np.nan for v in values], dtype=np.float64)
+
+
+def _to_datetime(values):
+    return np.array([v.replace(" ", "T") if v not in (MISSING, "", None) else "NaT" for v in values],
+                    dtype="datetime64[us]")
+
+
+def _to_pv(values):
+    lines = [[int(c) for c in v.split(",")] if v not in (MISSING, "", None) else [] for v in values]
+    pv = np.full((len(lines), max(1, max(map(len, lines), default=0))), -1, dtype=np.int8)
+    for i, line in enumerate(lines):
+        pv[i, :len(line)] = line
+    return pv
+
+
+def _to_root_scores(values):
+    scores = np.full((len(values), COLUMN_COUNT), np.nan)
+    for i, v in enumerate(values):
+        if v not in (MISSING, "", None):
+            scores[i] = _to_float(v.split(","))
+    return scores
+
+
+def parse_boards(board_flat):
+    """board_flat strings -> int8 (N, 42). Single-digit cells are decoded straight from the bytes."""
+    if not board_flat:
+        return np.zeros((0, BOARD_CELLS), dtype=np.int8)
+    width = 2 * BOARD_CELLS - 1
+    if all(len(b) == width for b in board_flat):
+        raw = np.frombuffer("".join(board_flat).encode("ascii"), dtype=np.uint8).reshape(len(board_flat), width)
+        return (raw[:, ::2] - ord("0")).astype(np.int8)
+    return np.array([[int(float(c)) for c in b.split(",")] for b in board_flat], dtype=np.int8)
+
+
+def _build_columns(records):
+    """records: dict of column name -> list of raw values (strings or numbers), same length."""
+    columns = {}
+    for name in CATEGORICAL_COLUMNS:
+        columns[name], columns[name + "_categories"] = _encode([str(v) for v in records[name]])
+    for name, dtype in INT_COLUMNS.items():
+        columns[name] = _to_int(records[name], dtype)
+    for name in FLOAT_COLUMNS:
+        columns[name] = _to_float(records[name])
+    columns["timestamp"] = _to_datetime(records["timestamp"])
+    columns["pv"] = _to_pv(records["principal_variation"])
+    columns["root_score_bounds"] = _to_root_scores(records["root_score_bounds"])
+    columns["boards"] = records["boards"]
+    return _group_by_session(columns)
+
+
+def _group_by_session(columns):
+    # sessions are contiguous in an append-only log; a stable sort keeps move order otherwise
+    codes = columns["session_id"]
+    order = np.argsort(codes, kind="stable")
+    if np.any(order != np.arange(len(order))):
+        for name, values in columns.items():
+            if not name.endswith("_categories"):
+                columns[name] = values[order]
+        codes = columns["session_id"]
+    counts = np.bincount(codes, minlength=len(columns["session_id_categories"]))
+    columns["session_offsets"] = np.concatenate(([0], np.cumsum(counts))).astype(np.int64)
+    return columns
+
+
+def csv_to_columns(csv_path=CONTINUOUS_CSV_FILE):
+    """Reads the gameplay CSV (any header version) into columns."""
+    names = CATEGORICAL_COLUMNS + list(INT_COLUMNS) + FLOAT_COLUMNS + ["timestamp", "principal_variation",
+                                                                      "root_score_bounds"]
+    records = {name: [] for name in names}
+    board_flat = []
+    with open(csv_path, "r", newline="", encoding="utf-8") as f:
+        for row in csv.DictReader(f):
+            for old_name, new_name in CSV_RENAMED_COLUMNS.items():
+                if old_name in row:
+                    row[new_name] = row.pop(old_name)
+            for name in names:
+                records[name].append(row.get(name, MISSING))
+            board_flat.append(row["board_flat"])
+    records["boards"] = parse_boards(board_flat)
+    return _build_columns(records)
+
+
+def json_to_columns(json_path, session_id=None):
+    """
+    Reads a JSON list of move records (the sample_dataset.json layout) into
+    columns. Fields the JSON does not have are stored as N/A; a new game
+    starts whenever move_number goes back down.
+    """
+    with open(json_path, "r", encoding="utf-8") as f:
+        moves = json.load(f)
+    session_id = session_id or os.path.splitext(os.path.basename(json_path))[0]
+    n = len(moves)
+    records = {name: [MISSING] * n for name in CATEGORICAL_COLUMNS + list(INT_COLUMNS) + FLOAT_COLUMNS
+               + ["principal_variation", "root_score_bounds"]}
+    records["session_id"] = [session_id] * n
+    game_number, last_move = 1, None
+    games = []
+    for move in moves:
+        if last_move is not None and move["move_number"] <= last_move:
+            game_number += 1
+        last_move = move["move_number"]
+        games.append(game_number)
+    records["game_number"] = games
+    records["move_number"] = [m["move_number"] for m in moves]
+    records["player"] = [m.get("player", MISSING) for m in moves]
+    records["chosen_column"] = [m["chosen_column"] for m in moves]
+    records["minimax_score"] = [m.get("minimax_calculated_score", MISSING) for m in moves]
+    records["ai_explanation"] = [m.get("ai_explanation") or MISSING for m in moves]
+    records["timestamp"] = [m.get("timestamp", MISSING) for m in moves]
+    records["boards"] = np.array([m["board_state"] for m in moves], dtype=np.int8).reshape(n, BOARD_CELLS)
+    return _build_columns(records)
+
+
+def save_npz(path, columns, compress=True):
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    (np.savez_compressed if compress else np.savez)(path, **columns)
+
+
+def load_npz(path):
+    """Loads every column into memory as a dict of arrays."""
+    with np.load(path, allow_pickle=False) as data:
+        return {name: data[name] for name in data.files}
+
+
+def decode(columns, name):
+    """Strings of a dictionary-encoded column."""
+    return columns[name + "_categories"][columns[name]]
+
+
+def sessions(columns):
+    """Yields (session_id, slice) for every session chunk."""
+    offsets = columns["session_offsets"]
+    categories = columns["session_id_categories"]
+    for k in range(len(offsets) - 1):
+        yield str(categories[k]), slice(int(offsets[k]), int(offsets[k + 1]))
+
+
+def _benchmark(rows, directory):
+    # synthetic log with the size of a long self-play run
+    rng = np.random.default_rng(0)
+    boards = rng.integers(0, 3, size=(rows, BOARD_CELLS), dtype=np.int8)
+    csv_path = os.path.join(directory, "bench.csv")
+    with open(csv_path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(["session_id", "game_number", "move_number", "player", "match_type", "game_mode",
+                         "difficulty", "chosen_column", "minimax_score", "search_depth", "ai_explanation",
+                         "p1_towers", "p2_towers", "board_flat", "timestamp"])
+        for i in range(rows):
+            writer.writerow([f"s{i // 10000}", i // 40, i % 40 + 1, "AI_Warrior", "PVE", "CLASSIC", "HARD",
+                             i % COLUMN_COUNT, float(i % 97), 8, "benchmark", 3, 3,
+                             ",".join(map(str, boards[i])), "2026-04-18 17:24:36.442826"])
+
+    start = time.perf_counter()
+    columns = csv_to_columns(csv_path)
+    convert = time.perf_counter() - start
+    npz_path = os.path.join(directory, "bench.npz")
+    save_npz(npz_path, columns)
+
+    start = time.perf_counter()
+    with open(csv_path, "r", newline="", encoding="utf-8") as f:
+        csv_boards = [[int(c) for c in row["board_flat"].split(",")] for row in csv.DictReader(f)]
+    csv_load = time.perf_counter() - start
+
+    start = time.perf_counter()
+    loaded = load_npz(npz_path)
+    npz_load = time.perf_counter() - start
+    assert np.array_equal(loaded["boards"], np.array(csv_boards, dtype=np.int8))
+    return convert, csv_load, npz_load, os.path.getsize(csv_path), os.path.getsize(npz_path)
+
+
+if __name__ == "__main__":
+    import argparse
+    import tempfile
+
+    parser = argparse.ArgumentParser(description="Convert gameplay logs (CSV or JSON) to the columnar NPZ format.")
+    parser.add_argument("source", nargs="?", default=CONTINUOUS_CSV_FILE, help=".csv log or .json move list")
+    parser.add_argument("out", nargs="?", help="output .npz (default: next to the source)")
+    parser.add_argument("--no-compress", action="store_true")
+    parser.add_argument("--bench", type=int, metavar="ROWS", help="time CSV against NPZ loading on ROWS synthetic rows")
+    args = parser.parse_args()
+
+    if args.bench:
+        with tempfile.TemporaryDirectory() as directory:
+            convert, csv_load, npz_load, csv_size, npz_size = _benchmark(args.bench, directory)
+        print(f"[BENCH] {args.bench} positions")
+        print(f"[BENCH] CSV -> columns : {convert:7.2f} s")
+        print(f"[BENCH] load CSV boards: {csv_load:7.2f} s   ({csv_size / 1e6:.1f} MB)")
+        print(f"[BENCH] load NPZ       : {npz_load:7.2f} s   ({npz_size / 1e6:.1f} MB)")
+    else:
+        if args.source.endswith(".json"):
+            columns = json_to_columns(args.source)
+        else:
+            columns = csv_to_columns(args.source)
+        out = args.out or os.path.splitext(args.source)[0] + ".npz"
+        save_npz(out, columns, compress=not args.no_compress)
+        print(f"[COLUMNAR] {len(columns['boards'])} positions, {len(columns['session_offsets']) - 1} sessions "
+              f"written to {out} ({os.path.getsize(out)} bytes)")
@@ -0,0 +1,76 @@
+import csv
+import math
+
+import numpy as np
+
+from .bitboard import AI_PIECE, COLUMN_COUNT, ROW_COUNT, board_to_bitboard
+from .ordering import CenterOrdering, HeuristicOrdering, MoveOrdering
+from .search import SearchLimits, minimax, terminal_score
+from .transposition import TranspositionTable
+
+# -------------------------------------------------------------------
+# MOVE ORDERING REPORT
+# Counts the nodes a fixed-depth search visits with each ordering scheme.
+# Usage: python -m engine.compare_ordering --depths 1 3 5 7
+# -------------------------------------------------------------------
+
+ORDERINGS = {
+    "left-to-right": MoveOrdering,
+    "center": CenterOrdering,
+    "center+killers": lambda: HeuristicOrdering(use_history=False),
+    "center+killers+history": HeuristicOrdering,
+}
+
+
+def count_nodes(bb, depth, ordering, use_tt=True):
+    """Node-count hook: nodes visited by one fixed-depth search of bb."""
+    limits = SearchLimits()
+    tt = TranspositionTable() if use_tt else None
+    minimax(bb.copy(), depth, -math.inf, math.inf, bb.current_piece == AI_PIECE, tt, limits, ordering)
+    return limits.nodes
+
+
+def compare_orderings(positions, depths):
+    """Returns {depth: {ordering name: total nodes}} over the given bitboards."""
+    results = {}
+    for depth in depths:
+        results[depth] = {}
+        for name, factory in ORDERINGS.items():
+            results[depth][name] = sum(count_nodes(bb, depth, factory()) for bb in positions)
+    return results
+
+
+def _load_positions(csv_path, limit):
+    # AI-to-move positions taken from the gameplay log (board after a PLAYER move)
+    positions = []
+    with open(csv_path, newline="", encoding="utf-8") as f:
+        for row in csv.DictReader(f):
+            if row["player"] != "PLAYER":
+                continue
+            cells = [int(x) for x in row["board_flat"].split(",")]
+            board = np.array(cells).reshape(ROW_COUNT, COLUMN_COUNT)
+            bb = board_to_bitboard(board, AI_PIECE)
+            if terminal_score(bb) is None:
+                positions.append(bb)
+            if len(positions) >= limit:
+                break
+    return positions
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Compare nodes visited per search for each move ordering.")
+    parser.add_argument("--csv", default="datasets/continuous_gameplay_log.csv")
+    parser.add_argument("--positions", type=int, default=20)
+    parser.add_argument("--depths", type=int, nargs="+", default=[1, 3, 5, 7],
+                        help="1 / 3 = EASY / MEDIUM, 5+ = HARD iterations")
+    args = parser.parse_args()
+
+    positions = _load_positions(args.csv, args.positions)
+    print(f"Positions: {len(positions)}")
+    for depth, row in compare_orderings(positions, args.depths).items():
+        baseline = row["left-to-right"]
+        print(f"\n--- Depth {depth} ---")
+        for name, nodes in row.items():
+            print(f"  {name:<24} {nodes:>10} nodes  ({nodes / baseline:6.1%} of left-to-right)")
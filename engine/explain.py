@@ -0,0 +1,125 @@
+from .bitboard import AI_PIECE, EMPTY, PLAYER_PIECE, other_piece
+from .board import drop_piece, get_next_open_row, get_valid_locations, winning_move_at
+from .search import DECISIVE_SCORE
+
+# -------------------------------------------------------------------
+# EXPLAINABLE AI
+# Turns an AIMove into the text shown in the terminal and logged to the
+# CSV. Everything comes from what the search already returned (score,
+# principal variation, root move scores) plus one-ply threat checks on
+# the board - no extra search is run.
+#   text = explain_move(board, move, "HARD")    # board before the move
+# -------------------------------------------------------------------
+
+# Moves of the expected line spelled out in the explanation
+PV_PLIES_SHOWN = 5
+
+NAMES = {AI_PIECE: "AI", PLAYER_PIECE: "player"}
+
+
+def winning_columns(board, piece):
+    """Columns where piece connects four right now."""
+    columns = []
+    for col in get_valid_locations(board):
+        row = get_next_open_row(board, col)
+        drop_piece(board, row, col, piece)
+        if winning_move_at(board, row, col, piece):
+            columns.append(col)
+        board[row][col] = EMPTY
+    return columns
+
+
+def _summary(move, difficulty):
+    # one sentence from the score alone (the original score thresholds)
+    col, score, depth = move.column, move.score, move.depth
+    if move.endgame is not None:
+        if move.endgame.outcome == "WIN":
+            return f"Endgame solved: AI has a forced win in {move.endgame.distance}."
+        if move.endgame.outcome == "LOSS":
+            return (f"Endgame solved: AI faces a forced loss in {move.endgame.distance} against perfect play "
+                    f"and delays it as long as possible.")
+        return "Endgame solved: perfect play from both sides leads to a draw."
+    if move.from_book:
+        return (f"AI played a prepared opening move from its book (column {col}, searched {depth} steps deep "
+                f"offline, Score: {score}).")
+    if score > DECISIVE_SCORE:
+        return "AI has found a definitive winning move or successfully blocked the opponent's absolute victory!"
+    if score < -DECISIVE_SCORE:
+        # The AI sees it is going to lose definitively
+        if difficulty in ["EASY", "NORMAL"]:
+            return (f"AI ({difficulty}) failed to see the trap early enough. It recognizes an unavoidable defeat "
+                    f"and makes a desperate move.")
+        return "Despite its deep calculations, AI realizes the player has established an unblockable winning condition."
+    if score <= -50:
+        return (f"AI is under heavy pressure (Score: {score}). It is struggling to defend against multiple "
+                f"player threats.")
+    if score < 0:
+        if difficulty == "EASY":
+            return f"AI (EASY) lacks deep foresight and is merely reacting to the immediate threat (Score: {score})."
+        return f"AI is playing defensively (Score: {score}) to neutralize the player's upcoming threats."
+    if col == 3:
+        return (f"AI selected the center column (Score: {score}) to maximize future horizontal and diagonal "
+                f"possibilities.")
+    if score > 50:
+        return f"AI detects a strong offensive opportunity (Score: {score}) and is building a strategic trap."
+    return f"AI calculated {depth} steps ahead and selected column {col} for steady strategic positioning."
+
+
+def _describe_line(board, pv):
+    #"AI 3, player 4, AI 2 - four in a row for AI" (plays the line on a copy)
+    board = board.copy()
+    piece = AI_PIECE
+    steps = []
+    for col in pv[:PV_PLIES_SHOWN]:
+        row = get_next_open_row(board, col)
+        drop_piece(board, row, col, piece)
+        steps.append(f"{NAMES[piece]} {col}")
+        if winning_move_at(board, row, col, piece):
+            return ", ".join(steps) + f" - four in a row for {NAMES[piece]}"
+        piece = other_piece(piece)
+    if len(pv) > PV_PLIES_SHOWN:
+        steps.append("...")
+    return ", ".join(steps)
+
+
+def explain_move(board, move, difficulty=None):
+    """
+    Explanation of move (an AIMove) chosen on board, the NumPy board before
+    the move with AI_PIECE to play. board is left unchanged.
+    """
+    col = move.column
+    sentences = [_summary(move, difficulty)]
+    if col is None:
+        return sentences[0]
+
+    board = board.copy()
+    threats = winning_columns(board, PLAYER_PIECE)
+    if col in winning_columns(board, AI_PIECE):
+        sentences.append(f"Column {col} connects four.")
+        return " ".join(sentences)
+    if col in threats:
+        others = [c for c in threats if c != col]
+        blocked = f"It blocks the player's threat at column {col}"
+        if others:
+            noun = "columns" if len(others) > 1 else "column"
+            blocked += f", but the player still threatens {noun} {', '.join(map(str, others))}"
+        sentences.append(blocked + ".")
+
+    if len(move.pv) > 1:
+        verb = "forces" if move.score > DECISIVE_SCORE else "expects"
+        line = _describe_line(board, move.pv)
+        sentences.append(f"It {verb} the line {line}" + ("" if line.endswith("...") else "."))
+
+    # the search's scores for other columns are only upper bounds - no runner-up is named from them
+    alternatives = {c: s for c, s in move.root_scores.items() if c != col}
+    if alternatives and not move.from_book:
+        also_win = sorted(c for c, s in alternatives.items() if s > DECISIVE_SCORE)
+        if move.endgame is not None and move.score > DECISIVE_SCORE:
+            # solver root scores are exact: other wins are slower, never faster
+            if also_win:
+                noun = "Columns" if len(also_win) > 1 else "Column"
+                sentences.append(f"{noun} {', '.join(map(str, also_win))} would win too, but not sooner.")
+        elif max(alternatives.values()) < -DECISIVE_SCORE and move.score > -DECISIVE_SCORE:
+            # an upper bound below a forced loss is a forced loss
+            sentences.append("Every other column loses by force.")
+    return " ".join(sentences)
@@ -0,0 +1,83 @@
+import numpy as np
+
+from .ai import DIFFICULTY_LEVELS, search_ai_move
+from .bitboard import AI_PIECE, EMPTY, PLAYER_PIECE, other_piece
+from .board import create_board, drop_piece, get_next_open_row, get_valid_locations, is_valid_location, winning_move_at
+from .search import SearchLimits
+from .transposition import TranspositionTable
+
+# -------------------------------------------------------------------
+# HEADLESS GAME
+# One game of Connect-4 without pygame: the board, whose turn it is and
+# the result. Scripts, tools and worker processes play through this.
+#   game = Game()
+#   game.play(3)
+#   move = game.search("HARD", time_ms=200)    # AIMove: move.column, move.score, move.stats ...
+# -------------------------------------------------------------------
+
+
+def _as_side_to_move(board, piece):
+    #the search always plays AI_PIECE - swap colors when the other side is to move
+    if piece == AI_PIECE:
+        return board
+    return np.where(board == EMPTY, EMPTY, (PLAYER_PIECE + AI_PIECE) - board)
+
+
+class Game:
+    """A single game on a NumPy board. Pieces are PLAYER_PIECE and AI_PIECE."""
+
+    def __init__(self, first_piece=PLAYER_PIECE, tt_size=None):
+        self.tt = TranspositionTable() if tt_size is None else TranspositionTable(tt_size)
+        self.new_game(first_piece)
+
+    def new_game(self, first_piece=PLAYER_PIECE):
+        self.board = create_board()
+        self.current_piece = first_piece
+        self.moves = []
+        self.winner = None
+        self.over = False
+        # positions of the previous game can never occur again
+        self.tt.clear()
+
+    def legal_moves(self):
+        if self.over:
+            return []
+        return get_valid_locations(self.board)
+
+    def play(self, col):
+        """Drops the current piece into col. Returns the row it landed on."""
+        if self.over:
+            raise ValueError("Game is already over")
+        if not 0 <= col < self.board.shape[1] or not is_valid_location(self.board, col):
+            raise ValueError(f"Column {col} is not a legal move")
+        piece = self.current_piece
+        row = get_next_open_row(self.board, col)
+        drop_piece(self.board, row, col, piece)
+        self.moves.append(col)
+        if winning_move_at(self.board, row, col, piece):
+            self.winner = piece
+            self.over = True
+        elif len(get_valid_locations(self.board)) == 0:
+            self.over = True
+        else:
+            self.current_piece = other_piece(piece)
+        return row
+
+    def search(self, level="HARD", time_ms=None, nodes=None, limits=None, tt=None):
+        """
+        Best move for the side to move, as an AIMove (see engine.ai). level is a
+        DIFFICULTY_LEVELS name or a level dict; time_ms and nodes override its
+        budget. The score is from the point of view of the side to move.
+        """
+        if isinstance(level, str):
+            level = DIFFICULTY_LEVELS[level]
+        if time_ms is not None or nodes is not None:
+            level = dict(level)
+            if time_ms is not None:
+                level["time_ms"] = time_ms
+            if nodes is not None:
+                level["nodes"] = nodes
+        if limits is None:
+            limits = SearchLimits(level.get("time_ms"), level.get("nodes"))
+        board = _as_side_to_move(self.board, self.current_piece)
+        return search_ai_move(board, level, limits, self.tt if tt is None else tt)
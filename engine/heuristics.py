@@ -0,0 +1,182 @@
+import numpy as np
+
+from .bitboard import AI_PIECE, COLUMN_COUNT, EMPTY, H1, PLAYER_PIECE, ROW_COUNT, WINDOW_LENGTH
+
+# -------------------------------------------------------------------
+# VECTORIZED HEURISTIC
+# All 69 winning lines are precomputed as a (69, 4) table of indices into
+# the flattened 6x7 board, so score_position is one gather plus a few sums
+# instead of Python list slicing and window.count() per window.
+# -------------------------------------------------------------------
+
+
+def _build_window_indices():
+    windows = []
+    # Horizontal
+    for r in range(ROW_COUNT):
+        for c in range(COLUMN_COUNT - 3):
+            windows.append([r * COLUMN_COUNT + c + i for i in range(WINDOW_LENGTH)])
+    # Vertical
+    for c in range(COLUMN_COUNT):
+        for r in range(ROW_COUNT - 3):
+            windows.append([(r + i) * COLUMN_COUNT + c for i in range(WINDOW_LENGTH)])
+    # Positive sloped diagonal
+    for r in range(ROW_COUNT - 3):
+        for c in range(COLUMN_COUNT - 3):
+            windows.append([(r + i) * COLUMN_COUNT + c + i for i in range(WINDOW_LENGTH)])
+    # Negative sloped diagonal
+    for r in range(ROW_COUNT - 3):
+        for c in range(COLUMN_COUNT - 3):
+            windows.append([(r + 3 - i) * COLUMN_COUNT + c + i for i in range(WINDOW_LENGTH)])
+    return np.array(windows, dtype=np.intp)
+
+
+WINDOW_INDICES = _build_window_indices()                                        # (69, 4)
+CENTER_INDICES = np.arange(ROW_COUNT) * COLUMN_COUNT + COLUMN_COUNT // 2        # (6,)
+
+
+def _build_window_score_table():
+    #WINDOW_SCORES[own, opp] = evaluate_window score of a line holding
+    #own pieces of the scored player and opp pieces of the opponent
+    table = np.zeros((WINDOW_LENGTH + 1, WINDOW_LENGTH + 1), dtype=np.int64)
+    for own in range(WINDOW_LENGTH + 1):
+        for opp in range(WINDOW_LENGTH + 1 - own):
+            window = [PLAYER_PIECE] * own + [AI_PIECE] * opp + [EMPTY] * (WINDOW_LENGTH - own - opp)
+            table[own, opp] = evaluate_window(window, PLAYER_PIECE)
+    return table
+
+
+def evaluate_window(window, piece):
+    score = 0
+    opp_piece = PLAYER_PIECE
+    if piece == PLAYER_PIECE:
+        opp_piece = AI_PIECE
+
+    #heuristic evaluation table - strategic weight point mechanism
+    #winning situation
+    if window.count(piece) == 4:
+        score += 100
+    #offensive threat
+    elif window.count(piece) == 3 and window.count(EMPTY) == 1:
+        score += 5
+    #strategic development process
+    elif window.count(piece) == 2 and window.count(EMPTY) == 2:
+        score += 2
+    #defensive block
+    if window.count(opp_piece) == 3 and window.count(EMPTY) == 1:
+        score -= 4
+
+    return score
+
+
+def score_position_reference(board, piece):
+    #original list-based scorer - kept as the parity reference for score_position
+    score = 0
+
+    # Score center column
+    #center column is critical area for winning the game
+    center_array = [int(i) for i in list(board[:, COLUMN_COUNT//2])]
+    center_count = center_array.count(piece)
+    #assign *3 point for pieces of the center columns
+    score += center_count * 3
+
+    # Score Horizontal
+    for r in range(ROW_COUNT):
+        row_array = [int(i) for i in list(board[r,:])]
+        for c in range(COLUMN_COUNT-3):
+            window = row_array[c:c+WINDOW_LENGTH]
+            score += evaluate_window(window, piece)
+
+    # Score Vertical
+    for c in range(COLUMN_COUNT):
+        col_array = [int(i) for i in list(board[:,c])]
+        #obstruct the memory overflow - boundary & index management
+        for r in range(ROW_COUNT-3):
+            window = col_array[r:r+WINDOW_LENGTH]
+            score += evaluate_window(window, piece)
+
+    # Score positive sloped diagonal
+    for r in range(ROW_COUNT-3):
+        for c in range(COLUMN_COUNT-3):
+            window = [board[r+i][c+i] for i in range(WINDOW_LENGTH)]
+            score += evaluate_window(window, piece)
+
+    for r in range(ROW_COUNT-3):
+        for c in range(COLUMN_COUNT-3):
+            window = [board[r+3-i][c+i] for i in range(WINDOW_LENGTH)]
+            score += evaluate_window(window, piece)
+
+    return score
+
+
+WINDOW_SCORES = _build_window_score_table()
+
+
+def score_position(board, piece):
+    """Vectorized score_position: same scores as score_position_reference."""
+    cells = np.asarray(board).reshape(-1)
+    lines = cells[WINDOW_INDICES]
+    opp_piece = PLAYER_PIECE if piece == AI_PIECE else AI_PIECE
+    own = np.count_nonzero(lines == piece, axis=1)
+    opp = np.count_nonzero(lines == opp_piece, axis=1)
+    center_count = np.count_nonzero(cells[CENTER_INDICES] == piece)
+    return int(center_count * 3 + WINDOW_SCORES[own, opp].sum())
+
+
+# -------------------------------------------------------------------
+# BATCHED EVALUATION
+# Scores a whole stack of boards in one NumPy pass - used for the last
+# ply of the search and for offline analysis of the gameplay logs.
+# -------------------------------------------------------------------
+
+BATCH_CHUNK_SIZE = 1 << 16
+
+# bit index of every flattened board cell (row-major, row 0 at the bottom)
+CELL_SHIFTS = np.array(
+    [c * H1 + r for r in range(ROW_COUNT) for c in range(COLUMN_COUNT)], dtype=np.uint64
+)
+
+
+def score_batch(boards, piece, chunk_size=BATCH_CHUNK_SIZE):
+    """
+    Scores an (N, 6, 7) or (N, 42) stack of boards for piece.
+    Returns (scores, terminal): int64 heuristic scores and a bool flag that
+    is True where either side has four in a row or the board is full.
+    """
+    cells = np.asarray(boards).reshape(-1, ROW_COUNT * COLUMN_COUNT)
+    opp_piece = PLAYER_PIECE if piece == AI_PIECE else AI_PIECE
+    scores = np.empty(len(cells), dtype=np.int64)
+    terminal = np.empty(len(cells), dtype=bool)
+    for start in range(0, len(cells), chunk_size):
+        chunk = cells[start:start + chunk_size]
+        lines = chunk[:, WINDOW_INDICES]                                # (n, 69, 4)
+        own = np.count_nonzero(lines == piece, axis=2)
+        opp = np.count_nonzero(lines == opp_piece, axis=2)
+        center_count = np.count_nonzero(chunk[:, CENTER_INDICES] == piece, axis=1)
+        scores[start:start + chunk_size] = center_count * 3 + WINDOW_SCORES[own, opp].sum(axis=1)
+        terminal[start:start + chunk_size] = (
+            (own == WINDOW_LENGTH).any(axis=1)
+            | (opp == WINDOW_LENGTH).any(axis=1)
+            | np.all(chunk != EMPTY, axis=1)
+        )
+    return scores, terminal
+
+
+def bitboards_to_boards(positions, masks, current_pieces):
+    """
+    Unpacks N bitboards into an (N, 6, 7) int8 stack.
+    positions / masks / current_pieces are sequences (or arrays) of length N.
+    """
+    positions = np.asarray(positions, dtype=np.uint64)
+    masks = np.asarray(masks, dtype=np.uint64)
+    current_pieces = np.asarray(current_pieces, dtype=np.int8)
+    own = ((positions[:, None] >> CELL_SHIFTS) & np.uint64(1)).astype(np.int8)
+    opp = (((positions ^ masks)[:, None] >> CELL_SHIFTS) & np.uint64(1)).astype(np.int8)
+    other_pieces = (PLAYER_PIECE + AI_PIECE) - current_pieces
+    boards = own * current_pieces[:, None] + opp * other_pieces[:, None]
+    return boards.reshape(-1, ROW_COUNT, COLUMN_COUNT)
+
+
+def score_bitboards(positions, masks, current_pieces, piece):
+    """score_batch for N bitboards given as (position, mask, side to move) sequences."""
+    return score_batch(bitboards_to_boards(positions, masks, current_pieces), piece)
@@ -0,0 +1,80 @@
+from .bitboard import AI_PIECE, COLUMN_COUNT, H1, PLAYER_PIECE, ROW_COUNT
+
+# -------------------------------------------------------------------
+# MOVE ORDERING
+# Alpha-beta prunes the most when the best move is searched first.
+# An ordering object decides the order of columns at every node and
+# learns from beta cutoffs through record_cutoff().
+# -------------------------------------------------------------------
+
+# Static center-out column order: 3, 2, 4, 1, 5, 0, 6
+CENTER_ORDER = sorted(range(COLUMN_COUNT), key=lambda c: (abs(c - COLUMN_COUNT // 2), c))
+
+
+class MoveOrdering:
+    """Original left-to-right order, with the transposition table move first."""
+
+    def order(self, bb, hash_move=None):
+        moves = bb.get_valid_locations()
+        if hash_move is not None and hash_move in moves:
+            moves.remove(hash_move)
+            moves.insert(0, hash_move)
+        return moves
+
+    def record_cutoff(self, bb, col, depth):
+        pass
+
+
+class CenterOrdering(MoveOrdering):
+    """Static center-out order, with the transposition table move first."""
+
+    def order(self, bb, hash_move=None):
+        heights = bb.heights
+        moves = [c for c in CENTER_ORDER if heights[c] < ROW_COUNT]
+        if hash_move is not None and hash_move in moves:
+            moves.remove(hash_move)
+            moves.insert(0, hash_move)
+        return moves
+
+
+class HeuristicOrdering(CenterOrdering):
+    """
+    Hash move first, then the killer moves of this ply, then the remaining
+    columns by history score (ties keep the center-out order).
+    """
+
+    def __init__(self, use_killers=True, use_history=True):
+        self.use_killers = use_killers
+        self.use_history = use_history
+        self.clear()
+
+    def clear(self):
+        # killers are indexed by ply (number of stones on the board)
+        self.killers = [[None, None] for _ in range(ROW_COUNT * COLUMN_COUNT + 1)]
+        # history is indexed by the cell a piece lands on
+        self.history = {piece: [0] * (COLUMN_COUNT * H1) for piece in (PLAYER_PIECE, AI_PIECE)}
+
+    def order(self, bb, hash_move=None):
+        heights = bb.heights
+        moves = [c for c in CENTER_ORDER if heights[c] < ROW_COUNT]
+        if self.use_history:
+            history = self.history[bb.current_piece]
+            moves.sort(key=lambda c: -history[c * H1 + heights[c]])
+        if self.use_killers:
+            for killer in reversed(self.killers[bb.move_count]):
+                if killer is not None and killer in moves:
+                    moves.remove(killer)
+                    moves.insert(0, killer)
+        if hash_move is not None and hash_move in moves:
+            moves.remove(hash_move)
+            moves.insert(0, hash_move)
+        return moves
+
+    def record_cutoff(self, bb, col, depth):
+        if self.use_killers:
+            killers = self.killers[bb.move_count]
+            if killers[0] != col:
+                killers[1] = killers[0]
+                killers[0] = col
+        if self.use_history:
+            self.history[bb.current_piece][col * H1 + bb.heights[col]] += depth * depth
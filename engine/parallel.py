@@ -0,0 +1,118 @@
+import math
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from .bitboard import AI_PIECE, PLAYER_PIECE, Bitboard
+from .ordering import CENTER_ORDER, HeuristicOrdering
+from .search import LOSS_SCORE, WIN_SCORE, SearchLimits, minimax
+from .transposition import TranspositionTable
+
+# -------------------------------------------------------------------
+# ROOT-PARALLEL SEARCH
+# The first root move (center-out order) is searched on its own to get
+# a bound. The remaining root moves are then spread over a process pool
+# and searched with that bound. Each task uses a fresh transposition
+# table, so at a fixed depth the result is the same best move and score
+# as the serial minimax with HeuristicOrdering.
+# Benchmark: python -m engine.parallel --depth 8 --workers 1 2 4 8
+# -------------------------------------------------------------------
+
+
+def _search_root_move(bb, col, depth, alpha, beta):
+    """Worker task: value of playing col at the root, plus the nodes it took."""
+    maximizing = bb.current_piece == AI_PIECE
+    mover = bb.current_piece
+    row = bb.get_next_open_row(col)
+    bb.drop_piece(col)
+    if bb.winning_move_at(row, col, mover):
+        return col, (WIN_SCORE if mover == AI_PIECE else LOSS_SCORE), 1
+    limits = SearchLimits()
+    value = minimax(bb, depth - 1, alpha, beta, not maximizing,
+                    TranspositionTable(), limits, HeuristicOrdering())[1]
+    return col, value, limits.nodes + 1
+
+
+class ParallelSearcher:
+    """Keeps a ProcessPoolExecutor warm across searches. Use as a context manager."""
+
+    def __init__(self, workers=None):
+        self.workers = workers or os.cpu_count() or 1
+        self.executor = ProcessPoolExecutor(max_workers=self.workers)
+        self.nodes = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.shutdown()
+
+    def shutdown(self):
+        self.executor.shutdown()
+
+    def search(self, bb, depth):
+        """Returns (column, score) for bb at a fixed depth, like minimax(bb, depth, -inf, inf, ...)."""
+        maximizing = bb.current_piece == AI_PIECE
+        moves = [c for c in CENTER_ORDER if bb.is_valid_location(c)]
+
+        # first move alone, with a full window -> bound for the others
+        col, best, nodes = _search_root_move(bb.copy(), moves[0], depth, -math.inf, math.inf)
+        self.nodes = nodes
+        alpha, beta = (best, math.inf) if maximizing else (-math.inf, best)
+
+        futures = [self.executor.submit(_search_root_move, bb.copy(), c, depth, alpha, beta)
+                   for c in moves[1:]]
+        results = [future.result() for future in futures]
+
+        # results come back in center-out order; the first strictly better move wins ties
+        best_col = col
+        for col, value, nodes in results:
+            self.nodes += nodes
+            if (value > best) if maximizing else (value < best):
+                best, best_col = value, col
+        return best_col, best
+
+
+def parallel_search(bb, depth, workers=None):
+    """One-off root-parallel search. Prefer ParallelSearcher for repeated searches."""
+    with ParallelSearcher(workers) as searcher:
+        return searcher.search(bb, depth)
+
+
+def _benchmark_positions():
+    # empty board plus two quiet openings, AI to move
+    positions = []
+    for moves in ([], [3, 3], [3, 2, 4, 3]):
+        bb = Bitboard(PLAYER_PIECE if len(moves) % 2 else AI_PIECE)
+        for col in moves:
+            bb.drop_piece(col)
+        positions.append(bb)
+    return positions
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Root-parallel search speedup against worker count.")
+    parser.add_argument("--depth", type=int, default=8)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    args = parser.parse_args()
+
+    positions = _benchmark_positions()
+
+    start = time.perf_counter()
+    serial = []
+    for bb in positions:
+        serial.append(minimax(bb.copy(), args.depth, -math.inf, math.inf, bb.current_piece == AI_PIECE,
+                              TranspositionTable(), None, HeuristicOrdering()))
+    serial_time = time.perf_counter() - start
+    print(f"[BENCH] serial      : {serial_time:7.3f} s   depth {args.depth}, {len(positions)} positions")
+
+    for workers in args.workers:
+        with ParallelSearcher(workers) as searcher:
+            searcher.search(positions[0], 1)  # warm up the pool
+            start = time.perf_counter()
+            results = [searcher.search(bb, args.depth) for bb in positions]
+            elapsed = time.perf_counter() - start
+        same = "same" if results == [tuple(r) for r in serial] else f"DIFFERENT {results} vs {serial}"
+        print(f"[BENCH] workers={workers:<3}: {elapsed:7.3f} s   speedup {serial_time / elapsed:5.2f}x   ({same} as serial)")
@@ -0,0 +1,43 @@
+import csv
+import sys
+
+import numpy as np
+
+from .bitboard import AI_PIECE, COLUMN_COUNT, PLAYER_PIECE, ROW_COUNT, board_to_bitboard
+from .heuristics import score_position, score_position_reference
+
+# -------------------------------------------------------------------
+# HEURISTIC PARITY CHECK
+# Scores every logged position with the original list-based scorer, the
+# vectorized NumPy scorer and the bitboard scorer, for both pieces, and
+# reports any position where they disagree.
+# Usage: python -m engine.parity [datasets/continuous_gameplay_log.csv]
+# -------------------------------------------------------------------
+
+
+def check_parity(csv_path):
+    """Returns (positions checked, list of mismatches) for the boards in csv_path."""
+    checked = 0
+    mismatches = []
+    with open(csv_path, newline="", encoding="utf-8") as f:
+        for line_no, row in enumerate(csv.DictReader(f), start=2):
+            cells = [int(x) for x in row["board_flat"].split(",")]
+            board = np.array(cells, dtype=float).reshape(ROW_COUNT, COLUMN_COUNT)
+            bb = board_to_bitboard(board, AI_PIECE)
+            for piece in (PLAYER_PIECE, AI_PIECE):
+                expected = score_position_reference(board, piece)
+                vectorized = score_position(board, piece)
+                bitboard = bb.score_position(piece)
+                if not expected == vectorized == bitboard:
+                    mismatches.append((line_no, piece, expected, vectorized, bitboard))
+            checked += 1
+    return checked, mismatches
+
+
+if __name__ == "__main__":
+    path = sys.argv[1] if len(sys.argv) > 1 else "datasets/continuous_gameplay_log.csv"
+    checked, mismatches = check_parity(path)
+    for line_no, piece, expected, vectorized, bitboard in mismatches:
+        print(f"[PARITY] line {line_no} piece {piece}: reference={expected} vectorized={vectorized} bitboard={bitboard}")
+    print(f"[PARITY] {checked} positions checked, {len(mismatches)} mismatches")
+    sys.exit(1 if mismatches else 0)
@@ -0,0 +1,205 @@
+import csv
+import os
+import sqlite3
+from collections import namedtuple
+
+import numpy as np
+
+from .bitboard import AI_PIECE, COLUMN_COUNT, EMPTY, PLAYER_PIECE, ROW_COUNT, board_to_bitboard
+from .board import winning_move_at
+from .book import book_key
+from .dataset import CONTINUOUS_CSV_FILE
+
+# -------------------------------------------------------------------
+# STREAMING DATASET READER AND POSITION INDEX
+# iter_positions() walks the gameplay CSV row by row (never the whole
+# file in memory) and yields the position *before* each logged move:
+# the logged board with the chosen column's top stone taken back off.
+# build_index() stores every position in a SQLite file keyed by its
+# canonical key (position + mask of the side to move, folded with the
+# mirror image, as in the opening book), with every occurrence and the
+# win/draw/loss tally of the rounds it was played in.
+# Build: python -m engine.positions --csv datasets/continuous_gameplay_log.csv
+# -------------------------------------------------------------------
+
+DEFAULT_INDEX_PATH = os.path.join("datasets", "position_index.sqlite")
+
+PositionRecord = namedtuple(
+    "PositionRecord",
+    "board side_to_move chosen_column minimax_score player session_id game_number move_number",
+)
+
+
+def _parse_score(value):
+    return float(value) if value not in ("N/A", "", None) else None
+
+
+def iter_positions(csv_path=CONTINUOUS_CSV_FILE):
+    """
+    Yields a PositionRecord per logged move: board is an int8 (ROW_COUNT,
+    COLUMN_COUNT) array before the move, side_to_move the piece that made it.
+    Rows whose board does not contain the move are skipped.
+    """
+    with open(csv_path, "r", newline="", encoding="utf-8") as f:
+        for row in csv.DictReader(f):
+            board = np.array(row["board_flat"].split(","), dtype=np.float64).astype(np.int8)
+            board = board.reshape(ROW_COUNT, COLUMN_COUNT)
+            col = int(row["chosen_column"])
+            filled = np.nonzero(board[:, col])[0]
+            if len(filled) == 0:
+                continue
+            top = filled[-1]
+            piece = int(board[top, col])
+            board[top, col] = EMPTY
+            yield PositionRecord(board, piece, col, _parse_score(row.get("minimax_score")), row["player"],
+                                 row["session_id"], int(row["game_number"]), int(row["move_number"]))
+
+
+def _round_result(record):
+    #winner of the round that ended with this move, None if it did not end in a win
+    board = record.board.copy()
+    row = int(np.count_nonzero(board[:, record.chosen_column]))
+    board[row, record.chosen_column] = record.side_to_move
+    if winning_move_at(board, row, record.chosen_column, record.side_to_move):
+        return record.side_to_move
+    return None
+
+
+def iter_rounds(records):
+    """
+    Groups records into rounds (one board from empty to the end) and yields
+    (records, result) - result is the winning piece, "DRAW" for a full board,
+    or None when the round was abandoned. CONQUER rounds share a game_number,
+    so a round also ends when the board gets emptier.
+    """
+    current = []
+
+    def finish():
+        last = current[-1]
+        winner = _round_result(last)
+        if winner is not None:
+            return winner
+        if int(np.count_nonzero(last.board)) + 1 == ROW_COUNT * COLUMN_COUNT:
+            return "DRAW"
+        return None
+
+    for record in records:
+        if current:
+            last = current[-1]
+            stones = int(np.count_nonzero(record.board))
+            if (record.session_id, record.game_number) != (last.session_id, last.game_number) \
+                    or stones <= int(np.count_nonzero(last.board)):
+                yield current, finish()
+                current = []
+        current.append(record)
+    if current:
+        yield current, finish()
+
+
+def _schema(db):
+    db.executescript("""
+        CREATE TABLE IF NOT EXISTS positions (
+            key INTEGER PRIMARY KEY,       -- canonical position + mask
+            board TEXT NOT NULL,           -- canonical board_flat, side to move = AI_PIECE
+            occurrences INTEGER NOT NULL,
+            wins INTEGER NOT NULL,         -- outcomes for the side to move
+            draws INTEGER NOT NULL,
+            losses INTEGER NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS occurrences (
+            key INTEGER NOT NULL,
+            session_id TEXT NOT NULL,
+            game_number INTEGER NOT NULL,
+            move_number INTEGER NOT NULL,
+            chosen_column INTEGER NOT NULL, -- in the canonical orientation
+            minimax_score REAL
+        );
+        CREATE INDEX IF NOT EXISTS occurrences_key ON occurrences (key);
+    """)
+
+
+def canonical(board, side_to_move):
+    """(key, canonical board_flat, mirrored) for a position with side_to_move to play."""
+    bb = board_to_bitboard(board, side_to_move)
+    key, mirrored = book_key(bb)
+    canonical_board = np.asarray(board, dtype=np.int8)
+    if side_to_move != AI_PIECE:
+        # store every position with the side to move as AI_PIECE, like the book
+        canonical_board = np.where(canonical_board == EMPTY, EMPTY, (PLAYER_PIECE + AI_PIECE) - canonical_board)
+    if mirrored:
+        canonical_board = canonical_board[:, ::-1]
+    return key, ",".join(str(int(c)) for c in canonical_board.ravel()), mirrored
+
+
+def build_index(csv_path=CONTINUOUS_CSV_FILE, db_path=DEFAULT_INDEX_PATH):
+    """Rebuilds the position index from the CSV. Returns (positions, unique positions)."""
+    os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
+    if os.path.exists(db_path):
+        os.remove(db_path)
+    total = 0
+    with sqlite3.connect(db_path) as db:
+        _schema(db)
+        for records, result in iter_rounds(iter_positions(csv_path)):
+            for record in records:
+                key, board_flat, mirrored = canonical(record.board, record.side_to_move)
+                col = COLUMN_COUNT - 1 - record.chosen_column if mirrored else record.chosen_column
+                if result is None:
+                    outcome = (0, 0, 0)
+                elif result == "DRAW":
+                    outcome = (0, 1, 0)
+                else:
+                    outcome = (1, 0, 0) if result == record.side_to_move else (0, 0, 1)
+                db.execute("""
+                    INSERT INTO positions VALUES (?, ?, 1, ?, ?, ?)
+                    ON CONFLICT (key) DO UPDATE SET occurrences = occurrences + 1,
+                        wins = wins + excluded.wins, draws = draws + excluded.draws, losses = losses + excluded.losses
+                """, (key, board_flat) + outcome)
+                db.execute("INSERT INTO occurrences VALUES (?, ?, ?, ?, ?, ?)",
+                           (key, record.session_id, record.game_number, record.move_number, col,
+                            record.minimax_score))
+                total += 1
+        unique = db.execute("SELECT COUNT(*) FROM positions").fetchone()[0]
+    return total, unique
+
+
+class PositionIndex:
+    """Read access to an index written by build_index()."""
+
+    def __init__(self, db_path=DEFAULT_INDEX_PATH):
+        self.db = sqlite3.connect(db_path)
+
+    def close(self):
+        self.db.close()
+
+    def __len__(self):
+        return self.db.execute("SELECT COUNT(*) FROM positions").fetchone()[0]
+
+    def lookup(self, board, side_to_move):
+        """Returns {occurrences, wins, draws, losses, moves} for a position, or None if it was never played."""
+        key, _, mirrored = canonical(board, side_to_move)
+        row = self.db.execute("SELECT occurrences, wins, draws, losses FROM positions WHERE key = ?",
+                              (key,)).fetchone()
+        if row is None:
+            return None
+        moves = [COLUMN_COUNT - 1 - c if mirrored else c for (c,) in
+                 self.db.execute("SELECT chosen_column FROM occurrences WHERE key = ?", (key,))]
+        return {"occurrences": row[0], "wins": row[1], "draws": row[2], "losses": row[3], "moves": moves}
+
+    def unique_positions(self):
+        """Yields (board, occurrences, wins, draws, losses) per unique position, AI_PIECE to move."""
+        for board_flat, occurrences, wins, draws, losses in self.db.execute(
+                "SELECT board, occurrences, wins, draws, losses FROM positions ORDER BY key"):
+            board = np.array(board_flat.split(","), dtype=np.int8).reshape(ROW_COUNT, COLUMN_COUNT)
+            yield board, occurrences, wins, draws, losses
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Build the deduplicated position index from the gameplay CSV.")
+    parser.add_argument("--csv", default=CONTINUOUS_CSV_FILE)
+    parser.add_argument("--db", default=DEFAULT_INDEX_PATH)
+    args = parser.parse_args()
+
+    total, unique = build_index(args.csv, args.db)
+    print(f"[INDEX] {total} positions, {unique} unique (mirrors folded) written to {args.db}")
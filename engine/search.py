@@ -0,0 +1,366 @@
+import math
+import random
+import time
+
+from .bitboard import AI_PIECE, COLUMN_COUNT, PLAYER_PIECE, ROW_COUNT, other_piece
+from .heuristics import score_bitboards
+from .ordering import HeuristicOrdering, MoveOrdering
+from .transposition import EXACT, LOWER, UPPER
+
+# Terminal scores (kept identical to the original NumPy minimax)
+WIN_SCORE = 100000000000000
+LOSS_SCORE = -10000000000000
+
+# Scores beyond this magnitude mean a forced result was found
+DECISIVE_SCORE = 1000000
+
+# How often (in nodes) the wall clock is checked
+CLOCK_CHECK_INTERVAL = 256
+
+# Used when minimax is called without an ordering
+PLAIN_ORDERING = MoveOrdering()
+
+# Expand the last ply in bulk and score all leaves with one NumPy call.
+# Off by default: the frontier gives up pruning at the last ply, and with
+# at most 7 leaves per call the NumPy overhead does not pay for it (measured
+# ~2x slower at depth 9 from the empty board). score_batch is the fast path
+# for large offline batches.
+BATCH_FRONTIER = False
+
+
+class SearchTimeout(Exception):
+    """Raised inside the search when the time or node budget is used up."""
+
+
+class SearchCancelled(SearchTimeout):
+    """Raised inside the search when the caller cancelled it."""
+
+
+class SearchLimits:
+    """
+    Wall-clock and node budget for one search. None means unlimited.
+    cancel is an optional threading.Event another thread can set to stop the search.
+    """
+
+    def __init__(self, time_ms=None, nodes=None, cancel=None):
+        self.deadline = None if time_ms is None else time.perf_counter() + time_ms / 1000.0
+        self.max_nodes = nodes
+        self.cancel = cancel
+        self.nodes = 0          # node-count instrumentation
+        self.leaf_evals = 0     # heuristic evaluations at depth 0
+        self.cutoffs = 0        # beta (or alpha) cutoffs
+        self.first_move_cutoffs = 0  # ... caused by the first move searched
+        self.enforced = True    # False -> only count, never abort
+
+    @property
+    def cancelled(self):
+        return self.cancel is not None and self.cancel.is_set()
+
+    def split(self, fraction):
+        """
+        New limits with fraction of the time and nodes left here and the same cancel
+        event - for a first attempt that must leave budget to a fallback search.
+        """
+        part = SearchLimits(cancel=self.cancel)
+        if self.deadline is not None:
+            now = time.perf_counter()
+            part.deadline = now + max(self.deadline - now, 0.0) * fraction
+        if self.max_nodes is not None:
+            part.max_nodes = int(max(self.max_nodes - self.nodes, 0) * fraction)
+        return part
+
+    def tick(self):
+        self.nodes += 1
+        if not self.enforced:
+            return
+        if self.max_nodes is not None and self.nodes > self.max_nodes:
+            raise SearchTimeout()
+        if self.nodes % CLOCK_CHECK_INTERVAL == 0:
+            if self.cancelled:
+                raise SearchCancelled()
+            if self.deadline is not None and time.perf_counter() > self.deadline:
+                raise SearchTimeout()
+
+
+class SearchStats:
+    """Counters of one search, filled in by iterative_deepening (or the caller for other searches)."""
+
+    __slots__ = ("nodes", "leaf_evals", "cutoffs", "first_move_cutoffs", "tt_hits", "tt_probes", "depth", "seconds")
+
+    def __init__(self):
+        for name in self.__slots__:
+            setattr(self, name, 0)
+
+    def add_limits(self, limits):
+        self.nodes += limits.nodes
+        self.leaf_evals += limits.leaf_evals
+        self.cutoffs += limits.cutoffs
+        self.first_move_cutoffs += limits.first_move_cutoffs
+
+    @property
+    def first_move_cutoff_rate(self):
+        return self.first_move_cutoffs / self.cutoffs if self.cutoffs else 0.0
+
+    @property
+    def tt_hit_rate(self):
+        return self.tt_hits / self.tt_probes if self.tt_probes else 0.0
+
+    @property
+    def nodes_per_second(self):
+        return self.nodes / self.seconds if self.seconds else 0.0
+
+    def __repr__(self):
+        return (f"{self.nodes} nodes ({self.leaf_evals} leaf evals), {self.cutoffs} cutoffs "
+                f"({self.first_move_cutoff_rate:.0%} on the first move), {self.tt_hits} TT hits, "
+                f"depth {self.depth}, {1000 * self.seconds:.1f} ms ({self.nodes_per_second:.0f} nodes/s)")
+
+
+#Minimax Algorithm Implementations (w/alpha-beta pruning) on the bitboard
+#make/unmake replaces board.copy() at every node
+#win detection is incremental: after each drop only the lines through the
+#new piece are checked, so a node never scans the whole board
+#tt: optional TranspositionTable shared between searches
+#limits: optional SearchLimits, raises SearchTimeout when exhausted
+#ordering: optional MoveOrdering deciding the column order at each node
+#root_scores: optional dict, filled with column -> score for every move searched
+#at this (root) node; moves other than the best are bounds, as alpha-beta leaves them
+def minimax(bb, depth, alpha, beta, maximizingPlayer, tt=None, limits=None, ordering=None, root_scores=None):
+    if limits is not None:
+        limits.tick()
+    if bb.is_full():
+        return (None, 0)
+    if depth == 0:
+        if limits is not None:
+            limits.leaf_evals += 1
+        return (None, bb.score_position(AI_PIECE))
+
+    alpha_orig, beta_orig = alpha, beta
+    hash_move = None
+    if tt is not None:
+        entry = tt.probe(bb.hash)
+        if entry is not None:
+            # best move of an earlier (shallower) search is tried first
+            hash_move = entry[3]
+        if entry is not None and entry[0] >= depth and root_scores is None:
+            _, tt_value, tt_flag, tt_move = entry
+            if tt_flag == EXACT:
+                return tt_move, tt_value
+            elif tt_flag == LOWER:
+                alpha = max(alpha, tt_value)
+            else:
+                beta = min(beta, tt_value)
+            if alpha >= beta:
+                return tt_move, tt_value
+
+    if ordering is None:
+        ordering = PLAIN_ORDERING
+    if depth == 1 and BATCH_FRONTIER and root_scores is None:
+        column, value = _minimax_frontier(bb, beta if maximizingPlayer else alpha, maximizingPlayer,
+                                          limits, ordering, hash_move)
+        _store(tt, bb, depth, value, alpha_orig, beta_orig, column)
+        return column, value
+
+    valid_locations = ordering.order(bb, hash_move)
+    if maximizingPlayer:
+        value = -math.inf
+        column = random.choice(valid_locations)
+        for col in valid_locations:
+            row = bb.get_next_open_row(col)
+            bb.drop_piece(col)
+            if bb.winning_move_at(row, col, AI_PIECE):
+                #definite victory for ai -> positive infinite value
+                new_score = WIN_SCORE
+            else:
+                new_score = minimax(bb, depth-1, alpha, beta, False, tt, limits, ordering)[1]
+            bb.undo_piece(col)
+            if root_scores is not None:
+                root_scores[col] = new_score
+            if new_score > value:
+                value = new_score
+                column = col
+            alpha = max(alpha, value)
+            if alpha >= beta:
+                ordering.record_cutoff(bb, col, depth)
+                if limits is not None:
+                    limits.cutoffs += 1
+                    if col == valid_locations[0]:
+                        limits.first_move_cutoffs += 1
+                break
+        _store(tt, bb, depth, value, alpha_orig, beta_orig, column)
+        return column, value
+
+    else: # Minimizing player
+        value = math.inf
+        column = random.choice(valid_locations)
+        for col in valid_locations:
+            row = bb.get_next_open_row(col)
+            bb.drop_piece(col)
+            if bb.winning_move_at(row, col, PLAYER_PIECE):
+                #definite victory for client -> negative infinite value
+                new_score = LOSS_SCORE
+            else:
+                new_score = minimax(bb, depth-1, alpha, beta, True, tt, limits, ordering)[1]
+            bb.undo_piece(col)
+            if root_scores is not None:
+                root_scores[col] = new_score
+            if new_score < value:
+                value = new_score
+                column = col
+            beta = min(beta, value)
+            if alpha >= beta:
+                ordering.record_cutoff(bb, col, depth)
+                if limits is not None:
+                    limits.cutoffs += 1
+                    if col == valid_locations[0]:
+                        limits.first_move_cutoffs += 1
+                break
+        _store(tt, bb, depth, value, alpha_orig, beta_orig, column)
+        return column, value
+
+
+#depth-1 node: every child is a leaf, so all of them are generated first and
+#the non-terminal ones are scored together. No pruning is needed at this ply,
+#the value returned is exact.
+def _minimax_frontier(bb, bound, maximizingPlayer, limits, ordering, hash_move):
+    mover = AI_PIECE if maximizingPlayer else PLAYER_PIECE
+    columns = ordering.order(bb, hash_move)
+    scores = [0] * len(columns)
+    pending, positions, masks = [], [], []
+    for i, col in enumerate(columns):
+        if limits is not None:
+            limits.tick()
+        row = bb.get_next_open_row(col)
+        bb.drop_piece(col)
+        if bb.winning_move_at(row, col, mover):
+            scores[i] = WIN_SCORE if maximizingPlayer else LOSS_SCORE
+        elif not bb.is_full():
+            pending.append(i)
+            positions.append(bb.position)
+            masks.append(bb.mask)
+        bb.undo_piece(col)
+
+    if pending:
+        if limits is not None:
+            limits.leaf_evals += len(pending)
+        leaf_scores, _ = score_bitboards(positions, masks, [other_piece(mover)] * len(pending), AI_PIECE)
+        for i, leaf_score in zip(pending, leaf_scores.tolist()):
+            scores[i] = leaf_score
+
+    column, value = columns[0], scores[0]
+    for col, score in zip(columns, scores):
+        if (score > value) if maximizingPlayer else (score < value):
+            value = score
+            column = col
+    # beta cutoff (alpha cutoff for the minimizer) feeds killers / history
+    if (value >= bound) if maximizingPlayer else (value <= bound):
+        ordering.record_cutoff(bb, column, 1)
+        if limits is not None:
+            limits.cutoffs += 1
+            if column == columns[0]:
+                limits.first_move_cutoffs += 1
+    return column, value
+
+
+def _store(tt, bb, depth, value, alpha_orig, beta_orig, column):
+    if tt is None:
+        return
+    if value <= alpha_orig:
+        flag = UPPER
+    elif value >= beta_orig:
+        flag = LOWER
+    else:
+        flag = EXACT
+    tt.store(bb.hash, depth, value, flag, column)
+
+
+def iterative_deepening(bb, max_depth, time_ms=None, nodes=None, tt=None, ordering=None, limits=None, stats=None,
+                        root_scores=None, iteration_times=None):
+    """
+    Searches depth 1, 2, 3 ... until max_depth or the time/node budget runs out.
+    Returns (column, score, reached_depth) of the last completed iteration.
+    bb must have the AI to move. Earlier iterations seed move ordering through
+    tt and the ordering's killer/history tables. Pass limits to read the node
+    count, or a SearchStats to have all counters of this search added to it.
+    root_scores (a dict) receives the root move scores of the last completed
+    iteration - see minimax. iteration_times (a list) receives the seconds
+    from the start to the end of every completed iteration.
+    """
+    if limits is None:
+        limits = SearchLimits(time_ms, nodes)
+    start = time.perf_counter()
+    tt_hits, tt_misses = (tt.hits, tt.misses) if tt is not None else (0, 0)
+    if ordering is None:
+        ordering = HeuristicOrdering()
+    maximizing = bb.current_piece == AI_PIECE
+    empty_cells = ROW_COUNT * COLUMN_COUNT - bb.move_count
+    column, value, reached_depth = None, None, 0
+
+    for depth in range(1, max_depth + 1):
+        # depth 1 always runs unlimited so there is a move to return
+        limits.enforced = reached_depth > 0
+        scores = None if root_scores is None else {}
+        try:
+            # work on a copy: an aborted iteration leaves moves on the board
+            column, value = minimax(bb.copy(), depth, -math.inf, math.inf, maximizing, tt, limits, ordering, scores)
+        except SearchTimeout:
+            break
+        reached_depth = depth
+        if iteration_times is not None:
+            iteration_times.append(time.perf_counter() - start)
+        if root_scores is not None:
+            root_scores.clear()
+            root_scores.update(scores)
+        if limits.cancelled:
+            break
+        # a forced result or a fully searched tree will not change with more depth
+        if abs(value) > DECISIVE_SCORE or depth >= empty_cells:
+            break
+        if limits.deadline is not None and time.perf_counter() > limits.deadline:
+            break
+
+    if stats is not None:
+        stats.add_limits(limits)
+        if tt is not None:
+            stats.tt_hits += tt.hits - tt_hits
+            stats.tt_probes += tt.hits - tt_hits + tt.misses - tt_misses
+        stats.depth = max(stats.depth, reached_depth)
+        stats.seconds += time.perf_counter() - start
+    return column, value, reached_depth
+
+
+def terminal_score(bb):
+    """Score of a position that is already over, or None if the game goes on."""
+    if bb.winning_move(AI_PIECE):
+        return WIN_SCORE
+    if bb.winning_move(PLAYER_PIECE):
+        return LOSS_SCORE
+    if bb.is_full():
+        return 0
+    return None
+
+
+def principal_variation(bb, tt, max_length, best=None):
+    """
+    Expected line from bb, read back from the transposition table by
+    following the stored best moves. Stops at a missing entry, an illegal
+    move (hash collision) or the end of the game. Reads the table with
+    peek, so the walk does not show up in its hit rate. When best (the
+    move the search returned) is given and the line does not start with
+    it, the root entry was overwritten and the line is just [best].
+    """
+    line = []
+    bb = bb.copy()
+    while len(line) < max_length:
+        entry = tt.peek(bb.hash)
+        if entry is None or entry[3] is None or not bb.is_valid_location(entry[3]):
+            break
+        col = entry[3]
+        row = bb.get_next_open_row(col)
+        mover = bb.current_piece
+        bb.drop_piece(col)
+        line.append(col)
+        if bb.winning_move_at(row, col, mover) or bb.is_full():
+            break
+    if best is not None and line[:1] != [best]:
+        return [best]
+    return line
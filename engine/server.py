@@ -0,0 +1,274 @@
+import asyncio
+import json
+import os
+import socket
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from .ai import opening_book
+from .bitboard import AI_PIECE, COLUMN_COUNT, EMPTY, PLAYER_PIECE, ROW_COUNT, board_to_bitboard
+from .board import (create_board, drop_piece, get_next_open_row, is_valid_location, winning_move,
+                    winning_move_at)
+from .game import _as_side_to_move
+from .search import SearchLimits, iterative_deepening, principal_variation, terminal_score
+from .transposition import DEFAULT_TT_SIZE, TranspositionTable
+
+# -------------------------------------------------------------------
+# ANALYSIS SERVER
+# Long-running "best move for this board" service. One JSON object per
+# line, over TCP or a Unix socket:
+#   request : {"id": 1, "board_flat": "0,0,1,...", "to_move": 2, "depth": 10, "time_ms": 500}
+#             or {"id": 1, "moves": [3, 3, 4], "depth": 10}
+#   response: {"id": 1, "column": 3, "score": 12, "pv": [3, 2, 3], "nodes": 48211,
+#              "depth": 10, "source": "search"}
+# board_flat uses the CSV layout (row 0 first). to_move must be the side
+# with fewer stones; on a tie it may be either and defaults to
+# PLAYER_PIECE. With "moves" the first move is PLAYER_PIECE's. Positions
+# no game can reach (stone counts more than one apart, floating stones,
+# play after a four-in-a-row) are rejected. Scores are from the side to
+# move. A book entry answers only when it was searched at least "depth"
+# deep ("source": "book", its own depth reported); "book": false skips it.
+# Without "time_ms" the depth is capped at DEFAULT_DEPTH; deeper searches
+# need a budget of at most MAX_TIME_MS.
+# Searches run on a process pool; each worker keeps its transposition
+# table and the memory-mapped opening book warm between requests.
+# Identical requests that arrive while one is being searched share it,
+# and finished results are kept in an LRU cache shared by all clients.
+# Run: python -m engine.server --port 8765   (or --unix /tmp/connect4.sock)
+# -------------------------------------------------------------------
+
+DEFAULT_PORT = 8765
+DEFAULT_DEPTH = 10
+RESULT_CACHE_SIZE = 4096
+MAX_DEPTH = ROW_COUNT * COLUMN_COUNT
+MAX_TIME_MS = 60000
+
+# per-worker state, created once by _init_worker
+_worker_tt = None
+
+
+def _init_worker(tt_size):
+    global _worker_tt
+    _worker_tt = TranspositionTable(tt_size)
+
+
+def analyse(cells, to_move, depth, time_ms, use_book):
+    """
+    Worker task: best move for the position. cells is the 42-cell board in
+    board_flat order. Returns the response fields as a dict.
+    """
+    if _worker_tt is None:
+        _init_worker(DEFAULT_TT_SIZE)
+    board = np.array(cells, dtype=np.float64).reshape(ROW_COUNT, COLUMN_COUNT)
+    # the engine searches for AI_PIECE - swap colors when the other side is to move
+    bb = board_to_bitboard(_as_side_to_move(board, to_move), AI_PIECE)
+
+    score = terminal_score(bb)
+    if score is not None:
+        return {"column": None, "score": score, "pv": [], "nodes": 0, "depth": 0, "source": "terminal"}
+
+    if use_book:
+        # only entries searched at least as deep as asked for stand in for the search
+        book_move = opening_book.lookup(bb, min_depth=depth)
+        if book_move is not None:
+            col, score, book_depth = book_move
+            return {"column": col, "score": score, "pv": [col], "nodes": 0, "depth": book_depth, "source": "book"}
+
+    limits = SearchLimits(time_ms)
+    col, score, reached = iterative_deepening(bb, depth, tt=_worker_tt, limits=limits)
+    pv = principal_variation(bb, _worker_tt, reached, best=col)
+    return {"column": col, "score": score, "pv": pv, "nodes": limits.nodes, "depth": reached, "source": "search"}
+
+
+def parse_request(request):
+    """Validates a request. Returns (cells, to_move, depth, time_ms, use_book) or raises ValueError."""
+    if "board_flat" in request:
+        cells = [int(float(c)) for c in str(request["board_flat"]).split(",")]
+        if len(cells) != ROW_COUNT * COLUMN_COUNT or any(c not in (EMPTY, PLAYER_PIECE, AI_PIECE) for c in cells):
+            raise ValueError(f"board_flat needs {ROW_COUNT * COLUMN_COUNT} cells of 0, 1 or 2")
+        for index in range(COLUMN_COUNT, ROW_COUNT * COLUMN_COUNT):
+            # row 0 is the bottom row: a stone needs a stone below it
+            if cells[index] != EMPTY and cells[index - COLUMN_COUNT] == EMPTY:
+                row, col = divmod(index, COLUMN_COUNT)
+                raise ValueError(f"board_flat has a floating stone at row {row}, column {col}")
+        ones, twos = cells.count(PLAYER_PIECE), cells.count(AI_PIECE)
+        # either side may start a game, so the counts differ by at most one
+        # and the side with fewer stones is the one to move
+        if abs(ones - twos) > 1:
+            raise ValueError(f"board_flat has {ones} stones of 1 and {twos} of 2")
+        fewer = PLAYER_PIECE if ones < twos else AI_PIECE if twos < ones else None
+        to_move = request.get("to_move", fewer or PLAYER_PIECE)
+        if to_move not in (PLAYER_PIECE, AI_PIECE):
+            raise ValueError("to_move must be 1 or 2")
+        if fewer is not None and to_move != fewer:
+            raise ValueError(f"to_move must be {fewer}, the side with fewer stones")
+        board = np.array(cells, dtype=np.float64).reshape(ROW_COUNT, COLUMN_COUNT)
+        one_won, two_won = winning_move(board, PLAYER_PIECE), winning_move(board, AI_PIECE)
+        if one_won and two_won:
+            raise ValueError("board_flat has four in a row for both sides")
+        # the game ends at a four-in-a-row, so its owner made the last move
+        if (one_won and to_move == PLAYER_PIECE) or (two_won and to_move == AI_PIECE):
+            raise ValueError("board_flat has moves played after a four-in-a-row")
+    elif "moves" in request:
+        board = create_board()
+        piece = PLAYER_PIECE
+        moves = request["moves"]
+        for ply, col in enumerate(moves):
+            if not isinstance(col, int) or not 0 <= col < COLUMN_COUNT or not is_valid_location(board, col):
+                raise ValueError(f"Illegal move {col!r} in moves")
+            row = get_next_open_row(board, col)
+            drop_piece(board, row, col, piece)
+            if winning_move_at(board, row, col, piece) and ply + 1 < len(moves):
+                raise ValueError(f"moves continue after a four-in-a-row at move {ply + 1}")
+            piece = AI_PIECE if piece == PLAYER_PIECE else PLAYER_PIECE
+        cells = [int(c) for c in board.ravel()]
+        to_move = request.get("to_move", piece)
+        if to_move != piece:
+            raise ValueError(f"to_move must be {piece} after these moves")
+    else:
+        raise ValueError("Request needs board_flat or moves")
+
+    depth = int(request.get("depth", DEFAULT_DEPTH))
+    if not 1 <= depth <= MAX_DEPTH:
+        raise ValueError(f"depth must be between 1 and {MAX_DEPTH}")
+    time_ms = request.get("time_ms")
+    if time_ms is not None:
+        time_ms = float(time_ms)
+        if not 0 < time_ms <= MAX_TIME_MS:
+            raise ValueError(f"time_ms must be between 0 and {MAX_TIME_MS}")
+    elif depth > DEFAULT_DEPTH:
+        # a deep search without a budget could hold a worker (and every
+        # request coalesced onto it) for hours
+        raise ValueError(f"depth above {DEFAULT_DEPTH} needs a time_ms budget")
+    return tuple(cells), to_move, depth, time_ms, bool(request.get("book", True))
+
+
+class AnalysisServer:
+    """asyncio JSON-lines front end over a warm process pool."""
+
+    def __init__(self, workers=None, tt_size=DEFAULT_TT_SIZE, cache_size=RESULT_CACHE_SIZE):
+        self.executor = ProcessPoolExecutor(max_workers=workers or os.cpu_count() or 1,
+                                            initializer=_init_worker, initargs=(tt_size,))
+        self.in_flight = {}
+        self.results = OrderedDict()
+        self.cache_size = cache_size
+        self.requests = 0
+        self.coalesced = 0
+        self.cache_hits = 0
+
+    async def analyse(self, job):
+        """Runs job on the pool; cached or already running identical jobs are not searched again."""
+        self.requests += 1
+        if job in self.results:
+            self.cache_hits += 1
+            self.results.move_to_end(job)
+            return self.results[job]
+        future = self.in_flight.get(job)
+        if future is not None:
+            self.coalesced += 1
+            return await asyncio.shield(future)
+        loop = asyncio.get_running_loop()
+        future = loop.run_in_executor(self.executor, analyse, *job)
+        self.in_flight[job] = future
+        try:
+            result = await asyncio.shield(future)
+        finally:
+            if self.in_flight.get(job) is future:
+                del self.in_flight[job]
+        self.results[job] = result
+        if len(self.results) > self.cache_size:
+            self.results.popitem(last=False)
+        return result
+
+    async def _respond(self, line, writer, lock):
+        response = {}
+        try:
+            request = json.loads(line)
+            if not isinstance(request, dict):
+                raise ValueError("Request must be a JSON object")
+            response["id"] = request.get("id")
+            if request.get("cmd") == "stats":
+                response.update(requests=self.requests, coalesced=self.coalesced, cache_hits=self.cache_hits,
+                                in_flight=len(self.in_flight))
+            else:
+                response.update(await self.analyse(parse_request(request)))
+        except (ValueError, TypeError) as e:
+            response["error"] = str(e)
+        except Exception as e:
+            # a failed search (or a broken worker) must still be answered, or the client waits forever
+            response["error"] = f"Internal error: {type(e).__name__}: {e}"
+        async with lock:
+            writer.write((json.dumps(response) + "\n").encode("utf-8"))
+            await writer.drain()
+
+    async def handle_client(self, reader, writer):
+        # requests of one client run concurrently; responses carry the request id
+        lock = asyncio.Lock()
+        tasks = set()
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                if not line.strip():
+                    continue
+                task = asyncio.create_task(self._respond(line, writer, lock))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+            if tasks:
+                await asyncio.gather(*tasks, return_exceptions=True)
+        finally:
+            writer.close()
+
+    async def serve(self, host="127.0.0.1", port=DEFAULT_PORT, unix_path=None):
+        if unix_path is not None:
+            server = await asyncio.start_unix_server(self.handle_client, path=unix_path)
+        else:
+            server = await asyncio.start_server(self.handle_client, host, port)
+        async with server:
+            await server.serve_forever()
+
+    def shutdown(self):
+        self.executor.shutdown(cancel_futures=True)
+
+
+def query(request, host="127.0.0.1", port=DEFAULT_PORT, unix_path=None, timeout=None):
+    """Blocking one-shot client: sends request (a dict), returns the response dict."""
+    if unix_path is not None:
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.settimeout(timeout)
+        sock.connect(unix_path)
+    else:
+        sock = socket.create_connection((host, port), timeout=timeout)
+    with sock, sock.makefile("rwb") as stream:
+        stream.write((json.dumps(request) + "\n").encode("utf-8"))
+        stream.flush()
+        return json.loads(stream.readline())
+
+
+if __name__ == "__main__":
+    import argparse
+    import signal
+    import sys
+
+    parser = argparse.ArgumentParser(description="Position analysis server (JSON lines over TCP or a Unix socket).")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--unix", metavar="PATH", help="listen on a Unix socket instead of TCP")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--tt-size", type=int, default=DEFAULT_TT_SIZE)
+    args = parser.parse_args()
+
+    server = AnalysisServer(args.workers, args.tt_size)
+    where = args.unix or f"{args.host}:{args.port}"
+    print(f"[SERVER] analysing on {where} with {args.workers} workers")
+    # a plain kill stops the pool workers as well
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+    try:
+        asyncio.run(server.serve(args.host, args.port, args.unix))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.shutdown()
@@ -0,0 +1,140 @@
+from collections import namedtuple
+
+from .bitboard import COLUMN_COUNT, H1, ROW_COUNT, aligned
+from .ordering import CENTER_ORDER
+
+# -------------------------------------------------------------------
+# ENDGAME SOLVER
+# Perfect play once few empty cells remain: negamax with alpha-beta,
+# null-window (binary search) probing and a transposition table of upper
+# bounds. Scores follow the usual solver convention, from the side to move:
+#   > 0  win,  the sooner the win the bigger the score
+#   = 0  draw
+#   < 0  loss, the later the loss the closer to zero
+# -------------------------------------------------------------------
+
+BOARD_CELLS = ROW_COUNT * COLUMN_COUNT
+
+# Default number of empty cells at which the game hands over to the solver
+DEFAULT_SOLVER_EMPTY_CELLS = 18
+
+SolveResult = namedtuple("SolveResult", "column score outcome distance nodes")
+
+
+def empty_cells(bb):
+    return BOARD_CELLS - bb.move_count
+
+
+def _winning_column(bb, col):
+    #can the side to move connect four by playing col right now?
+    return aligned(bb.position | (1 << (col * H1 + bb.heights[col])))
+
+
+def moves_to_result(score, move_count):
+    """
+    Converts a solver score into the number of moves of the winning side
+    (including the final one) until four are connected. 0 for a draw.
+    """
+    if score > 0:
+        return (BOARD_CELLS + 3 - move_count) // 2 - score
+    if score < 0:
+        # the opponent moves next, from move_count + 1
+        return (BOARD_CELLS + 3 - (move_count + 1)) // 2 + score
+    return 0
+
+
+class Solver:
+    """Exact Connect-4 solver for bitboards. The table is kept between solves."""
+
+    def __init__(self, limits=None):
+        self.table = {}
+        self.limits = limits
+        self.nodes = 0
+        self.root_scores = {}  # column -> exact score of the last best_move() root
+
+    def negamax(self, bb, alpha, beta):
+        self.nodes += 1
+        if self.limits is not None:
+            self.limits.tick()
+        moves = bb.move_count
+        if moves == BOARD_CELLS:
+            return 0
+
+        valid = [c for c in CENTER_ORDER if bb.heights[c] < ROW_COUNT]
+        for col in valid:
+            if _winning_column(bb, col):
+                return (BOARD_CELLS + 1 - moves) // 2
+
+        # upper bound: we cannot win before our next-but-one move
+        max_score = (BOARD_CELLS - 1 - moves) // 2
+        upper = self.table.get(bb.hash)
+        if upper is not None:
+            max_score = upper
+        if beta > max_score:
+            beta = max_score
+            if alpha >= beta:
+                return beta
+
+        for col in valid:
+            bb.drop_piece(col)
+            score = -self.negamax(bb, -beta, -alpha)
+            bb.undo_piece(col)
+            if score >= beta:
+                if self.limits is not None:
+                    self.limits.cutoffs += 1
+                    if col == valid[0]:
+                        self.limits.first_move_cutoffs += 1
+                return score
+            if score > alpha:
+                alpha = score
+
+        self.table[bb.hash] = alpha
+        return alpha
+
+    def solve(self, bb):
+        """Exact score of bb for the side to move (null-window search)."""
+        moves = bb.move_count
+        if moves == BOARD_CELLS:
+            return 0
+        low = -(BOARD_CELLS - moves) // 2
+        high = (BOARD_CELLS + 1 - moves) // 2
+        while low < high:
+            med = low + (high - low) // 2
+            if med <= 0 and low // 2 < med:
+                med = low // 2
+            elif med >= 0 and high // 2 > med:
+                med = high // 2
+            result = self.negamax(bb, med, med + 1)
+            if result <= med:
+                high = result
+            else:
+                low = result
+        return low
+
+    def best_move(self, bb):
+        """Returns a SolveResult with the best column for the side to move."""
+        self.nodes = 0
+        self.root_scores = {}
+        moves = bb.move_count
+        best_col, best_score = None, None
+        for col in CENTER_ORDER:
+            if not bb.is_valid_location(col):
+                continue
+            if _winning_column(bb, col):
+                best_col, best_score = col, (BOARD_CELLS + 1 - moves) // 2
+                self.root_scores = {col: best_score}
+                break
+            bb.drop_piece(col)
+            score = -self.solve(bb)
+            bb.undo_piece(col)
+            self.root_scores[col] = score
+            if best_score is None or score > best_score:
+                best_col, best_score = col, score
+
+        if best_score > 0:
+            outcome = "WIN"
+        elif best_score < 0:
+            outcome = "LOSS"
+        else:
+            outcome = "DRAW"
+        return SolveResult(best_col, best_score, outcome, moves_to_result(best_score, moves), self.nodes)
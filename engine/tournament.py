@@ -0,0 +1,200 @@
+import itertools
+import math
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from .ai import DIFFICULTY_LEVELS
+from .bitboard import AI_PIECE, PLAYER_PIECE
+from .game import Game
+from .transposition import TranspositionTable
+
+# -------------------------------------------------------------------
+# SELF-PLAY TOURNAMENT
+# Plays AI-vs-AI games without pygame, spread over a process pool.
+# A player is a difficulty name (EASY, NORMAL, HARD) or a level spec
+# like "depth=6" or "depth=12,time_ms=200,book=1".
+# CLASSIC: one game, first four in a row wins.
+# CONQUER: rounds are played until one side has no towers left, as in
+# the game's process_win - a round win destroys one enemy tower, a draw
+# costs nothing.
+# Run: python -m engine.tournament --players HARD NORMAL --games 100 --mode CLASSIC
+# -------------------------------------------------------------------
+
+CONQUER_TOWERS = 3
+# CONQUER rounds between two deterministic players can repeat forever on draws
+MAX_CONQUER_ROUNDS = 50
+
+
+def parse_player(spec):
+    """Level dict for a difficulty name or a "key=value,..." spec."""
+    if spec in DIFFICULTY_LEVELS:
+        return dict(DIFFICULTY_LEVELS[spec])
+    level = {"label": spec}
+    for part in spec.split(","):
+        key, sep, value = part.partition("=")
+        if not sep:
+            raise ValueError(f"Unknown player {spec!r}: expected a difficulty or key=value pairs")
+        level[key.strip()] = int(value)
+    if "depth" not in level:
+        raise ValueError(f"Player {spec!r} needs a depth")
+    return level
+
+
+def _play_round(levels, first, opening_plies, rng):
+    """
+    One game. levels maps piece -> level, first is the piece that starts.
+    Returns (winner piece or None, moves, {piece: [think seconds per move]}).
+    """
+    game = Game(first, tt_size=1)  # each side searches with its own table
+    tables = {piece: TranspositionTable() for piece in levels}
+    think = {piece: [] for piece in levels}
+
+    # a few random opening moves so deterministic players do not replay one game
+    for _ in range(opening_plies):
+        if game.over:
+            break
+        game.play(rng.choice(game.legal_moves()))
+
+    while not game.over:
+        piece = game.current_piece
+        start = time.perf_counter()
+        col = game.search(levels[piece], tt=tables[piece])[0]
+        think[piece].append(time.perf_counter() - start)
+        game.play(col)
+    return game.winner, len(game.moves), think
+
+
+def play_match(args):
+    """
+    Worker task: one CLASSIC game or one CONQUER match between players a and b.
+    Returns a dict with a's score (1, 0.5, 0), the moves played and think times.
+    """
+    spec_a, spec_b, mode, index, opening_plies, seed = args
+    rng = random.Random(seed * 1000003 + index)
+    # a plays PLAYER_PIECE, b plays AI_PIECE; who starts alternates by game index
+    levels = {PLAYER_PIECE: parse_player(spec_a), AI_PIECE: parse_player(spec_b)}
+    first = PLAYER_PIECE if index % 2 == 0 else AI_PIECE
+    think = {PLAYER_PIECE: [], AI_PIECE: []}
+    moves = 0
+    rounds = 0
+
+    if mode == "CLASSIC":
+        winner, moves, round_think = _play_round(levels, first, opening_plies, rng)
+        for piece in think:
+            think[piece] += round_think[piece]
+        rounds = 1
+    else:
+        towers = {PLAYER_PIECE: CONQUER_TOWERS, AI_PIECE: CONQUER_TOWERS}
+        winner = None
+        while rounds < MAX_CONQUER_ROUNDS:
+            round_winner, round_moves, round_think = _play_round(levels, first, opening_plies, rng)
+            for piece in think:
+                think[piece] += round_think[piece]
+            moves += round_moves
+            rounds += 1
+            if round_winner is not None:
+                loser = AI_PIECE if round_winner == PLAYER_PIECE else PLAYER_PIECE
+                towers[loser] -= 1
+                if towers[loser] == 0:
+                    winner = round_winner
+                    break
+            # next round: the other side starts
+            first = AI_PIECE if first == PLAYER_PIECE else PLAYER_PIECE
+
+    score = 0.5 if winner is None else 1.0 if winner == PLAYER_PIECE else 0.0
+    return {
+        "score": score,
+        "moves": moves,
+        "rounds": rounds,
+        "think_a": think[PLAYER_PIECE],
+        "think_b": think[AI_PIECE],
+    }
+
+
+def elo_estimate(scores, z=1.96):
+    """
+    Elo difference for the side whose per-game scores are given, with a
+    Wilson confidence interval on the raw score. Returns (elo, low, high).
+    The point estimate adds half a win and half a loss, so a 0/N or N/N
+    match still gives a finite Elo; the open end of its interval is +-inf.
+    """
+    def to_elo(p):
+        if p <= 0:
+            return -math.inf
+        if p >= 1:
+            return math.inf
+        return 400 * math.log10(p / (1 - p))
+
+    n = len(scores)
+    elo = to_elo((sum(scores) + 0.5) / (n + 1))
+    if n == 0:
+        return elo, -math.inf, math.inf
+    p = sum(scores) / n
+    # Wilson score interval: stays inside [0, 1] and is not degenerate at 0/N or N/N
+    centre = (p + z * z / (2 * n)) / (1 + z * z / n)
+    margin = z * math.sqrt(p * (1 - p) / n + z * z / (4 * n * n)) / (1 + z * z / n)
+    return elo, to_elo(centre - margin), to_elo(centre + margin)
+
+
+def run_pairing(spec_a, spec_b, games, mode, opening_plies=2, seed=0, executor=None):
+    """Plays games between a and b. Returns the list of play_match results."""
+    jobs = [(spec_a, spec_b, mode, index, opening_plies, seed) for index in range(games)]
+    if executor is None:
+        return [play_match(job) for job in jobs]
+    return list(executor.map(play_match, jobs))
+
+
+def _average_ms(times):
+    return 1000 * sum(times) / len(times) if times else 0.0
+
+
+def summarize(spec_a, spec_b, mode, results):
+    """Report lines for one pairing, from a's point of view."""
+    scores = [r["score"] for r in results]
+    wins = scores.count(1.0)
+    draws = scores.count(0.5)
+    losses = scores.count(0.0)
+    elo, low, high = elo_estimate(scores)
+    think_a = [t for r in results for t in r["think_a"]]
+    think_b = [t for r in results for t in r["think_b"]]
+    moves = sum(r["moves"] for r in results) / len(results)
+
+    lines = [
+        f"[TOURNAMENT] {spec_a} vs {spec_b} - {mode}, {len(results)} games",
+        f"  W/D/L ({spec_a})  : {wins} / {draws} / {losses}   score {100 * sum(scores) / len(scores):.1f}%",
+        f"  Elo ({spec_a})    : {elo:+.0f}  (95% CI {low:+.0f} .. {high:+.0f})",
+        f"  Moves per {'game ' if mode == 'CLASSIC' else 'match'}: {moves:.1f}",
+    ]
+    if mode == "CONQUER":
+        lines.append(f"  Rounds per match: {sum(r['rounds'] for r in results) / len(results):.1f}")
+    lines.append(f"  Think time/move : {spec_a} {_average_ms(think_a):.1f} ms, {spec_b} {_average_ms(think_b):.1f} ms")
+    return lines
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Headless AI-vs-AI tournament.")
+    parser.add_argument("--players", nargs="+", default=["HARD", "NORMAL", "EASY"],
+                        help="difficulty names or specs like depth=6,time_ms=200 (every pair plays)")
+    parser.add_argument("--games", type=int, default=20, help="games (or CONQUER matches) per pairing")
+    parser.add_argument("--mode", choices=["CLASSIC", "CONQUER", "BOTH"], default="BOTH")
+    parser.add_argument("--opening-plies", type=int, default=2, help="random moves before the players take over")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    for spec in args.players:
+        parse_player(spec)  # fail early on a bad spec
+    modes = ["CLASSIC", "CONQUER"] if args.mode == "BOTH" else [args.mode]
+
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=args.workers) as executor:
+        for mode in modes:
+            for spec_a, spec_b in itertools.combinations(args.players, 2):
+                results = run_pairing(spec_a, spec_b, args.games, mode, args.opening_plies, args.seed, executor)
+                print("\n".join(summarize(spec_a, spec_b, mode, results)))
+                print("-" * 50)
+    print(f"[TOURNAMENT] finished in {time.perf_counter() - start:.1f} s with {args.workers} workers")
@@ -0,0 +1,75 @@
+# -------------------------------------------------------------------
+# TRANSPOSITION TABLE
+# Remembers searched positions (keyed by the Zobrist hash) so identical
+# positions reached through different move orders are not searched twice.
+# Each slot holds two entries:
+#   depth-preferred -> only replaced by an equal or deeper search
+#   always-replace  -> takes whatever the depth-preferred entry rejected
+# -------------------------------------------------------------------
+
+# Bound types
+EXACT = 0
+LOWER = 1   # value is a lower bound (fail-high / beta cutoff)
+UPPER = 2   # value is an upper bound (fail-low)
+
+DEFAULT_TT_SIZE = 1 << 18
+
+
+class TranspositionTable:
+    """Fixed-size hash table of (key, depth, value, flag, best_move) entries."""
+
+    def __init__(self, size=DEFAULT_TT_SIZE):
+        if size < 1:
+            raise ValueError("Transposition table size must be positive")
+        self.size = size
+        self.clear()
+
+    def clear(self):
+        self._deep = [None] * self.size
+        self._recent = [None] * self.size
+        self.hits = 0
+        self.misses = 0
+        self.collisions = 0
+
+    def probe(self, key):
+        """Returns (depth, value, flag, best_move) for key, or None."""
+        index = key % self.size
+        entry = self._deep[index]
+        if entry is not None and entry[0] == key:
+            self.hits += 1
+            return entry[1:]
+        recent = self._recent[index]
+        if recent is not None and recent[0] == key:
+            self.hits += 1
+            return recent[1:]
+        self.misses += 1
+        if entry is not None or recent is not None:
+            # slot is occupied by a different position
+            self.collisions += 1
+        return None
+
+    def peek(self, key):
+        """Like probe, but leaves the hit/miss/collision counters alone."""
+        index = key % self.size
+        for entry in (self._deep[index], self._recent[index]):
+            if entry is not None and entry[0] == key:
+                return entry[1:]
+        return None
+
+    def store(self, key, depth, value, flag, best_move):
+        index = key % self.size
+        entry = (key, depth, value, flag, best_move)
+        deep = self._deep[index]
+        if deep is None or deep[0] == key or depth >= deep[1]:
+            self._deep[index] = entry
+        else:
+            self._recent[index] = entry
+
+    def stats(self):
+        probes = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "collisions": self.collisions,
+            "hit_rate": self.hits / probes if probes else 0.0,
+        }